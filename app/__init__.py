@@ -10,6 +10,7 @@ from app.api.v1.routes import auth_router, monitoring_router
 from app.core.config import settings
 from app.core.log import get_logger
 from app.core.db import database
+from app.core.metrics import metrics
 
 logger = get_logger(__name__, settings.LOG_FILE_PATH)
 
@@ -67,5 +68,10 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def get_metrics():
+    return await metrics.snapshot()
+
+
 app.include_router(auth_router)
 app.include_router(monitoring_router)
\ No newline at end of file
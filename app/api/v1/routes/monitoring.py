@@ -1,11 +1,13 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, HttpUrl
 
 from app.modules.auth.dependencies import get_current_user
 from app.modules.user.models import User
 from app.modules.monitoring.services import MonitoringService
 from app.modules.monitoring.models import MonitoringTarget, ChangeDetection, Snapshot
+from app.modules.monitoring.scheduling import effective_check_frequency
 
 router = APIRouter(prefix="/api/v1/monitoring", tags=["monitoring"])
 
@@ -14,11 +16,45 @@ class CreateTargetRequest(BaseModel):
     url: HttpUrl
     target_type: str
     check_frequency: int = 3600
+    adaptive_frequency: bool = False
+    min_check_frequency: Optional[int] = None
+    max_check_frequency: Optional[int] = None
+    include_selectors: List[str] = []
+    exclude_selectors: List[str] = []
+    normalization_rules: List[str] = []
+    debug_capture: str = "off"
 
 
 class UpdateTargetRequest(BaseModel):
     check_frequency: Optional[int] = None
     is_active: Optional[bool] = None
+    adaptive_frequency: Optional[bool] = None
+    min_check_frequency: Optional[int] = None
+    max_check_frequency: Optional[int] = None
+    include_selectors: Optional[List[str]] = None
+    exclude_selectors: Optional[List[str]] = None
+    normalization_rules: Optional[List[str]] = None
+    debug_capture: Optional[str] = None
+
+
+class SelectorPreviewRequest(BaseModel):
+    url: HttpUrl
+    include_selectors: List[str] = []
+    exclude_selectors: List[str] = []
+    normalization_rules: List[str] = []
+
+
+class SelectorPreviewResponse(BaseModel):
+    url: str
+    title: str
+    content_preview: str
+    normalized_preview: str
+    content_length: int
+    content_hash: str
+    hash_scheme: str
+    include_matches: Dict[str, int]
+    exclude_matches: Dict[str, int]
+    truncated: bool = False
 
 
 class TargetResponse(BaseModel):
@@ -27,7 +63,18 @@ class TargetResponse(BaseModel):
     target_type: str
     check_frequency: int
     is_active: bool
+    adaptive_frequency: bool = False
+    min_check_frequency: Optional[int] = None
+    max_check_frequency: Optional[int] = None
+    effective_check_frequency: int
+    include_selectors: List[str] = []
+    exclude_selectors: List[str] = []
+    normalization_rules: List[str] = []
+    debug_capture: str = "off"
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
     last_checked: Optional[str] = None
+    next_check_at: Optional[str] = None
     created_at: str
 
     class Config:
@@ -57,6 +104,33 @@ class SnapshotResponse(BaseModel):
         from_attributes = True
 
 
+def _target_response(target: MonitoringTarget) -> TargetResponse:
+    return TargetResponse(
+        id=str(target.id),
+        url=str(target.url),
+        target_type=target.target_type,
+        check_frequency=target.check_frequency,
+        is_active=target.is_active,
+        adaptive_frequency=target.adaptive_frequency,
+        min_check_frequency=target.min_check_frequency,
+        max_check_frequency=target.max_check_frequency,
+        effective_check_frequency=effective_check_frequency(
+            target, datetime.utcnow()
+        ),
+        include_selectors=target.include_selectors,
+        exclude_selectors=target.exclude_selectors,
+        normalization_rules=target.normalization_rules,
+        debug_capture=target.debug_capture,
+        consecutive_failures=target.consecutive_failures,
+        last_error=target.last_error,
+        last_checked=target.last_checked.isoformat() if target.last_checked else None,
+        next_check_at=target.next_check_at.isoformat()
+        if target.next_check_at
+        else None,
+        created_at=target.created_at.isoformat(),
+    )
+
+
 @router.post(
     "/targets", response_model=TargetResponse, status_code=status.HTTP_201_CREATED
 )
@@ -69,39 +143,43 @@ async def create_monitoring_target(
             url=str(request.url),
             target_type=request.target_type,
             check_frequency=request.check_frequency,
+            adaptive_frequency=request.adaptive_frequency,
+            min_check_frequency=request.min_check_frequency,
+            max_check_frequency=request.max_check_frequency,
+            include_selectors=request.include_selectors,
+            exclude_selectors=request.exclude_selectors,
+            normalization_rules=request.normalization_rules,
+            debug_capture=request.debug_capture,
         )
 
-        return TargetResponse(
-            id=str(target.id),
-            url=str(target.url),
-            target_type=target.target_type,
-            check_frequency=target.check_frequency,
-            is_active=target.is_active,
-            last_checked=target.last_checked.isoformat()
-            if target.last_checked
-            else None,
-            created_at=target.created_at.isoformat(),
+        return _target_response(target)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/selectors/preview", response_model=SelectorPreviewResponse)
+async def preview_selectors(
+    request: SelectorPreviewRequest, current_user: User = Depends(get_current_user)
+):
+    """Fetch a page and show the text a set of selectors would monitor"""
+    try:
+        return await MonitoringService.preview_selectors(
+            str(request.url),
+            request.include_selectors,
+            request.exclude_selectors,
+            request.normalization_rules,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Could not fetch page: {e}")
 
 
 @router.get("/targets", response_model=List[TargetResponse])
 async def get_monitoring_targets(current_user: User = Depends(get_current_user)):
     targets = await MonitoringService.get_user_targets(str(current_user.id))
 
-    return [
-        TargetResponse(
-            id=str(t.id),
-            url=str(t.url),
-            target_type=t.target_type,
-            check_frequency=t.check_frequency,
-            is_active=t.is_active,
-            last_checked=t.last_checked.isoformat() if t.last_checked else None,
-            created_at=t.created_at.isoformat(),
-        )
-        for t in targets
-    ]
+    return [_target_response(t) for t in targets]
 
 
 @router.get("/targets/{target_id}", response_model=TargetResponse)
@@ -113,15 +191,7 @@ async def get_monitoring_target(
     if not target:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    return TargetResponse(
-        id=str(target.id),
-        url=str(target.url),
-        target_type=target.target_type,
-        check_frequency=target.check_frequency,
-        is_active=target.is_active,
-        last_checked=target.last_checked.isoformat() if target.last_checked else None,
-        created_at=target.created_at.isoformat(),
-    )
+    return _target_response(target)
 
 
 @router.patch("/targets/{target_id}", response_model=TargetResponse)
@@ -132,22 +202,17 @@ async def update_monitoring_target(
 ):
     updates = request.dict(exclude_unset=True)
 
-    target = await MonitoringService.update_target(
-        target_id, str(current_user.id), **updates
-    )
+    try:
+        target = await MonitoringService.update_target(
+            target_id, str(current_user.id), **updates
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if not target:
         raise HTTPException(status_code=404, detail="Target not found")
 
-    return TargetResponse(
-        id=str(target.id),
-        url=str(target.url),
-        target_type=target.target_type,
-        check_frequency=target.check_frequency,
-        is_active=target.is_active,
-        last_checked=target.last_checked.isoformat() if target.last_checked else None,
-        created_at=target.created_at.isoformat(),
-    )
+    return _target_response(target)
 
 
 @router.delete("/targets/{target_id}", status_code=status.HTTP_204_NO_CONTENT)
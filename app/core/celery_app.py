@@ -1,7 +1,15 @@
 import platform
 from celery import Celery
+from kombu import Queue
 from app.core.config import settings
 
+SWEEP_QUEUE = "sweep"
+HTTP_SCRAPE_QUEUE = "scrape.http"
+BROWSER_SCRAPE_QUEUE = "scrape.browser"
+NOTIFY_QUEUE = "notify"
+
+BROWSER_TARGET_TYPES = {"linkedin_profile", "linkedin_company"}
+
 celery_app = Celery(
     "monitoring_agent",
     broker=settings.REDIS_URL,
@@ -9,6 +17,16 @@ celery_app = Celery(
     include=["app.modules.monitoring.tasks"],
 )
 
+
+def route_target_check(name, args, kwargs, options, task=None, **kw):
+    """Send browser-backed target checks to their own queue"""
+    if name != "app.modules.monitoring.tasks.check_single_target":
+        return None
+    if (kwargs or {}).get("target_type") in BROWSER_TARGET_TYPES:
+        return {"queue": BROWSER_SCRAPE_QUEUE}
+    return {"queue": HTTP_SCRAPE_QUEUE}
+
+
 # Windows-specific configuration
 if platform.system() == "Windows":
     celery_app.conf.update(
@@ -22,6 +40,22 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_queues=[
+        Queue(SWEEP_QUEUE),
+        Queue(HTTP_SCRAPE_QUEUE),
+        Queue(BROWSER_SCRAPE_QUEUE),
+        Queue(NOTIFY_QUEUE),
+    ],
+    task_default_queue=SWEEP_QUEUE,
+    task_routes=(
+        route_target_check,
+        {
+            "app.modules.monitoring.tasks.check_all_targets": {"queue": SWEEP_QUEUE},
+            "app.modules.monitoring.tasks.send_notification_email": {
+                "queue": NOTIFY_QUEUE
+            },
+        },
+    ),
     beat_schedule={
         "check-monitoring-targets": {
             "task": "app.modules.monitoring.tasks.check_all_targets",
@@ -29,3 +63,13 @@ celery_app.conf.update(
         },
     },
 )
+
+# Dedicated per-queue worker profile. Applied at import so it is in place
+# before the worker reads its concurrency and prefetch defaults; explicit
+# --concurrency / --prefetch-multiplier on the command line still win.
+if settings.CELERY_WORKER_QUEUE:
+    _queue = settings.CELERY_WORKER_QUEUE
+    if _queue in settings.CELERY_QUEUE_CONCURRENCY:
+        celery_app.conf.worker_concurrency = settings.CELERY_QUEUE_CONCURRENCY[_queue]
+    if _queue in settings.CELERY_QUEUE_PREFETCH:
+        celery_app.conf.worker_prefetch_multiplier = settings.CELERY_QUEUE_PREFETCH[_queue]
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Dict, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -38,6 +39,98 @@ class Settings(BaseSettings):
 
     REDIS_URL: str
 
+    # Celery worker profiles (per queue)
+    CELERY_WORKER_QUEUE: Optional[str] = None  # queue this worker is dedicated to
+    CELERY_QUEUE_CONCURRENCY: Dict[str, int] = {
+        "sweep": 1,
+        "scrape.http": 32,
+        "scrape.browser": 2,
+        "notify": 8,
+    }
+    CELERY_QUEUE_PREFETCH: Dict[str, int] = {
+        "sweep": 1,
+        "scrape.http": 4,
+        "scrape.browser": 1,
+        "notify": 16,
+    }
+
+    # Scheduling
+    SWEEP_PAGE_SIZE: int = 500
+    SWEEP_BATCH_SIZE: int = 100
+    SWEEP_DISPATCH_GRACE_SECONDS: int = 600
+    SWEEP_MODE: str = "fanout"  # "fanout" or "concurrent"
+    SWEEP_CONCURRENCY: Dict[str, int] = {
+        "website": 16,
+        "linkedin_profile": 1,
+        "linkedin_company": 1,
+    }
+    SWEEP_DEFAULT_CONCURRENCY: int = 4
+    TARGET_LEASE_TTL_SECONDS: int = 900
+
+    # HTTP fetch engine (website checks)
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_ENABLE_HTTP2: bool = False  # needs the optional 'h2' package
+    HTTP_MAX_BODY_BYTES: int = 2 * 1024 * 1024
+
+    # Scraping politeness, per registrable domain and shared across workers
+    SCRAPE_HOST_RATE: float = 1.0  # requests per second
+    SCRAPE_HOST_BURST: int = 2
+    SCRAPE_HOST_MAX_IN_FLIGHT: int = 2
+    LINKEDIN_RATE: float = 0.1
+    LINKEDIN_BURST: int = 1
+    LINKEDIN_MAX_IN_FLIGHT: int = 1
+    SCRAPE_IN_FLIGHT_TTL_SECONDS: int = 300
+    SCRAPE_RATE_LIMIT_MAX_WAIT: int = 300
+
+    # Failure handling
+    FAILURE_BACKOFF_MAX_SECONDS: int = 86400
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_COOLDOWN_SECONDS: int = 300
+    CIRCUIT_MAX_COOLDOWN_SECONDS: int = 6 * 3600
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
+
+    # LinkedIn browser pool, per worker process; keep LINKEDIN_MAX_IN_FLIGHT
+    # in step when raising the pool size
+    LINKEDIN_DRIVER_POOL_SIZE: int = 1
+    LINKEDIN_BROWSER_PROFILE: str = "standard"  # or "lightweight": headless, no images/fonts/media
+    LINKEDIN_DRIVER_CHECKOUT_TIMEOUT: int = 120
+    LINKEDIN_DRIVER_IDLE_SECONDS: int = 900
+    LINKEDIN_DRIVER_MAX_USES: int = 100
+    LINKEDIN_SESSION_TIMEOUT_SECONDS: int = 300  # re-check the session after this much idle
+
+    # Website extraction
+    # 0 = extract on the event loop; needs a --pool threads/solo worker, not prefork
+    EXTRACTION_PROCESS_POOL_SIZE: int = 0
+    EXTRACTION_INLINE_MAX_BYTES: int = 32 * 1024  # smaller pages skip the pool
+
+    # Debug page captures (opt-in per target via debug_capture)
+    DEBUG_CAPTURE_DIR: str = "debug_html"
+    DEBUG_CAPTURE_SAMPLE_RATE: float = 0.05  # share of checks kept in "sample" mode
+    DEBUG_CAPTURE_MAX_PER_TARGET: int = 20
+    DEBUG_CAPTURE_MAX_BYTES: int = 256 * 1024 * 1024
+    DEBUG_CAPTURE_QUEUE_SIZE: int = 64
+    DEBUG_CAPTURE_COMPRESSION: str = "auto"  # "auto" (zstd if installed) or "gzip"
+
+    # Change classification by SimHash similarity to the last analyzed content
+    CHANGE_TRIVIAL_SIMILARITY: float = 0.95  # at or above: skip AI entirely
+    CHANGE_MINOR_SIMILARITY: float = 0.85  # at or above: counted as minor
+
+    # Shared fetch cache: targets watching the same URL share one scrape
+    FETCH_CACHE_ENABLED: bool = True
+    FETCH_CACHE_MAX_AGE_FRACTION: float = 0.5  # of the reader's check interval
+    FETCH_CACHE_MAX_TTL_SECONDS: int = 3600
+    FETCH_COALESCE_LOCK_SECONDS: int = 300  # longest a single scrape may take
+    FETCH_COALESCE_WAIT_SECONDS: int = 180  # then fetch independently
+
+    # Adaptive check frequency
+    ADAPTIVE_EWMA_ALPHA: float = 0.3
+    ADAPTIVE_SAMPLING_FACTOR: float = 0.5  # checks per expected change interval
+    ADAPTIVE_MAX_STRETCH: int = 24  # default max = check_frequency * this
+    ADAPTIVE_HISTORY_SIZE: int = 20
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
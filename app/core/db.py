@@ -48,10 +48,17 @@ class Database:
             self.client = None
             self.database = None
 
+    async def ensure_connected(self):
+        """Connect unless a connection is already established"""
+        if not self.is_connected():
+            await self.connect()
+
     async def disconnect(self):
         """Close database connection"""
         if self.client:
             await self.client.close()
+            self.client = None
+            self.database = None
             logger.info("🔌 Database disconnected")
 
     def is_connected(self) -> bool:
@@ -0,0 +1,89 @@
+"""
+Process-local counters and timings, flushed to Redis.
+
+Recording is an in-memory operation that is safe from any thread (including
+Selenium worker threads); ``flush()`` pushes the accumulated deltas to Redis
+hashes shared by every process so the API can report fleet-wide totals.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+from app.core.config import settings
+from app.core.log import get_logger
+from app.core.redis_client import get_redis
+
+logger = get_logger(__name__, settings.LOG_FILE_PATH)
+
+
+class Metrics:
+    """Counter and timing registry"""
+
+    COUNTERS_KEY = "metrics:counters"
+    TIMINGS_KEY = "metrics:timings"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._timings: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+
+    def incr(self, name: str, amount: int = 1):
+        """Increment counter ``name``"""
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name: str, seconds: float):
+        """Record one duration sample for timing ``name``"""
+        with self._lock:
+            timing = self._timings[name]
+            timing[0] += 1
+            timing[1] += seconds
+
+    async def flush(self):
+        """Push accumulated deltas to Redis"""
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(int)
+            timings, self._timings = self._timings, defaultdict(lambda: [0, 0.0])
+
+        if not counters and not timings:
+            return
+
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for name, value in counters.items():
+                    pipe.hincrby(self.COUNTERS_KEY, name, value)
+                for name, (count, total) in timings.items():
+                    pipe.hincrby(self.TIMINGS_KEY, f"{name}:count", count)
+                    pipe.hincrbyfloat(self.TIMINGS_KEY, f"{name}:seconds", total)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not flush metrics: {e}")
+            with self._lock:
+                for name, value in counters.items():
+                    self._counters[name] += value
+                for name, (count, total) in timings.items():
+                    self._timings[name][0] += count
+                    self._timings[name][1] += total
+
+    async def snapshot(self) -> dict:
+        """Fleet-wide totals as stored in Redis"""
+        redis = get_redis()
+        counters = await redis.hgetall(self.COUNTERS_KEY)
+        raw_timings = await redis.hgetall(self.TIMINGS_KEY)
+
+        timings = {}
+        for key, value in raw_timings.items():
+            name, _, field = key.rpartition(":")
+            timings.setdefault(name, {})[field] = float(value)
+        for timing in timings.values():
+            count = timing.get("count", 0)
+            timing["avg_seconds"] = timing.get("seconds", 0.0) / count if count else 0.0
+
+        return {
+            "counters": {name: int(value) for name, value in counters.items()},
+            "timings": timings,
+        }
+
+
+metrics = Metrics()
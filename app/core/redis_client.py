@@ -0,0 +1,34 @@
+"""
+Shared asyncio Redis client.
+
+Redis connections are bound to the event loop that created them, so one client
+is kept per running loop (the worker runtime loop, the API loop, ...).
+"""
+
+import asyncio
+import weakref
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis() -> Redis:
+    """Return the Redis client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        _clients[loop] = client
+    return client
+
+
+async def close_redis():
+    """Close the Redis client for the running event loop, if any"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
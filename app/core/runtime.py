@@ -0,0 +1,138 @@
+"""
+Per-process runtime for Celery workers.
+
+Keeps one event loop, one database connection and one set of monitoring
+agents alive for the lifetime of a worker process instead of rebuilding them
+per task.
+"""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from app.core.config import settings
+from app.core.db import database
+from app.core.log import get_logger
+from app.core.metrics import metrics
+from app.core.redis_client import close_redis
+from app.modules.monitoring.agents import MonitoringAgents
+from app.modules.monitoring.browser_executor import browser_executor
+from app.modules.monitoring.debug_capture import debug_capture
+from app.modules.monitoring.extraction_pool import extraction_pool
+from app.modules.monitoring.http_client import http_fetcher
+
+logger = get_logger(__name__, settings.LOG_FILE_PATH)
+
+
+class WorkerRuntime:
+    """Long-lived event loop, database connection and agents for a worker process"""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._agents: Optional[MonitoringAgents] = None
+        self._lock = threading.Lock()
+        self._agents_lock = threading.Lock()
+
+    def start(self):
+        """Start the loop thread and connect to the database"""
+        with self._lock:
+            if self.loop is not None:
+                return
+
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self.loop.run_forever, name="worker-runtime", daemon=True
+            )
+            self._thread.start()
+            logger.info("🔁 Worker runtime event loop started")
+
+        self._submit(database.ensure_connected())
+        # Pay the graph compile / client setup cost before the first task
+        self.agents
+
+    @property
+    def agents(self) -> MonitoringAgents:
+        """Process-wide MonitoringAgents, built on first use
+
+        The agents hold no per-check state (it lives in the graph state), so one
+        instance is shared by every task and concurrent sweep in the process.
+        """
+        if self._agents is None:
+            with self._agents_lock:
+                if self._agents is None:
+                    logger.info("🤖 Building process-wide monitoring agents")
+                    self._agents = MonitoringAgents()
+        return self._agents
+
+    def run(self, coro: Coroutine) -> Any:
+        """Run ``coro`` on the process loop and block until it completes"""
+        if self.loop is None:
+            # Pools that never fire worker_process_init (e.g. solo) start lazily
+            self.start()
+        elif not database.is_connected():
+            self._submit(database.ensure_connected())
+
+        return self._submit(self._run_and_flush(coro))
+
+    def shutdown(self):
+        """Release the agents, close the database connection and stop the loop"""
+        # Let running browser scrapes hand their drivers back before the pool closes
+        browser_executor.shutdown()
+
+        with self._agents_lock:
+            if self._agents is not None:
+                try:
+                    self._agents.cleanup()
+                except Exception as e:
+                    logger.warning(f"⚠️ Error cleaning up monitoring agents: {e}")
+                self._agents = None
+
+        extraction_pool.shutdown()
+        debug_capture.close()
+
+        with self._lock:
+            if self.loop is None:
+                return
+
+            try:
+                self._submit(self._ashutdown())
+            except Exception as e:
+                logger.warning(f"⚠️ Error during worker runtime shutdown: {e}")
+            finally:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self._thread.join(timeout=10)
+                self.loop.close()
+                self.loop = None
+                self._thread = None
+                logger.info("🧹 Worker runtime stopped")
+
+    async def _run_and_flush(self, coro: Coroutine) -> Any:
+        try:
+            return await coro
+        finally:
+            await metrics.flush()
+
+    async def _ashutdown(self):
+        await http_fetcher.aclose()
+        await metrics.flush()
+        await close_redis()
+        await database.disconnect()
+
+    def _submit(self, coro: Coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+
+runtime = WorkerRuntime()
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs):
+    runtime.shutdown()
@@ -5,19 +5,40 @@ import operator
 from datetime import datetime
 from .scraper import ScraperService
 from .ai_service import GeminiAnalysisService
-from .email_service import EmailNotificationService
 from .models import MonitoringTarget, ChangeDetection, Snapshot
+from .circuit_breaker import host_circuit_breaker
+from .debug_capture import Capture, capture_reason, debug_capture
+from .extractor import ExtractionSpec
+from .fetch_cache import fetch_cache
+from .fingerprint import similarity
+from .linkedin_extractor import changed_sections, sections_text
+from .rate_limiter import RateLimitTimeout, host_rate_limiter
+from .scheduling import (
+    compute_next_check_at,
+    effective_check_frequency,
+    record_change,
+)
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.metrics import metrics
 from app.modules.user.models import User
-import difflib
+import asyncio
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Failed checks that say nothing about the target, so they don't back it off
+_NOT_TARGET_FAILURES = {"rate_limited", "rejected"}
+
 
 class MonitoringState(TypedDict):
     target: MonitoringTarget
     scraped_data: dict
     has_changes: bool
+    rebaselined: bool
+    change_class: str  # "", "trivial", "minor", "substantial" or "fields"
+    changed_sections: list  # LinkedIn document sections that changed
     change_summary: str
     ai_analysis: dict
     ai_insights: dict
@@ -30,7 +51,6 @@ class MonitoringAgents:
     def __init__(self):
         self.scraper = ScraperService()
         self.ai_service = GeminiAnalysisService()
-        self.email_service = EmailNotificationService()
         self.graph = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
@@ -42,22 +62,67 @@ class MonitoringAgents:
         workflow.add_node("notify", self._notify_node)
 
         workflow.set_entry_point("scrape")
-        workflow.add_edge("scrape", "analyze")
-        workflow.add_edge("analyze", "ai_analysis")
+        workflow.add_conditional_edges(
+            "scrape", self._route_after_scrape, {"analyze": "analyze", "end": END}
+        )
+        workflow.add_conditional_edges(
+            "analyze",
+            self._route_after_analyze,
+            {"ai_analysis": "ai_analysis", "end": END},
+        )
         workflow.add_edge("ai_analysis", "notify")
         workflow.add_edge("notify", END)
 
         return workflow.compile()
 
-    def _scrape_node(self, state: MonitoringState) -> MonitoringState:
+    def _route_after_scrape(self, state: MonitoringState) -> str:
+        # A 304 means nothing changed - skip hashing, AI and notifications
+        if state["scraped_data"].get("not_modified"):
+            return "end"
+        return "analyze"
+
+    def _route_after_analyze(self, state: MonitoringState) -> str:
+        # A re-baselined hash says nothing about the page - don't spend AI on it
+        if state.get("rebaselined"):
+            return "end"
+        # Unchanged or trivially changed since an existing baseline: nothing to
+        # analyze. Only first snapshots and real changes reach the AI.
+        if not state["has_changes"] and state["target"].last_content_hash:
+            return "end"
+        return "ai_analysis"
+
+    def _classify_change(self, target: MonitoringTarget, scraped_data: dict):
+        """Grade a hash change by SimHash similarity to the last analyzed content"""
+        current = scraped_data.get("simhash")
+        if not current or not target.last_simhash:
+            return "substantial", None
+
+        score = similarity(current, target.last_simhash)
+        if score >= settings.CHANGE_TRIVIAL_SIMILARITY:
+            return "trivial", score
+        if score >= settings.CHANGE_MINOR_SIMILARITY:
+            return "minor", score
+        return "substantial", score
+
+    async def _scrape_node(self, state: MonitoringState) -> MonitoringState:
         target = state["target"]
         logger.info(
             f"🕷️  Starting scrape for target: {target.url} (type: {target.target_type})"
         )
 
+        url = str(target.url)
+        spec = ExtractionSpec.for_target(target)
+        max_age = fetch_cache.max_age(
+            effective_check_frequency(target, datetime.utcnow())
+        )
         try:
-            logger.info(f"🔄 Initiating scraper for URL: {str(target.url)}")
-            scraped_data = self.scraper.scrape_url(str(target.url), target.target_type)
+            scraped_data = await fetch_cache.get_or_fetch(
+                url,
+                target.target_type,
+                spec,
+                max_age,
+                lambda: self._fetch(target, spec),
+            )
             logger.info(f"✅ Scraper completed. Data keys: {list(scraped_data.keys())}")
             logger.info(f"📊 Content length: {len(scraped_data.get('content', ''))}")
             logger.info(f"🔑 Content hash: {scraped_data.get('content_hash', 'None')}")
@@ -67,9 +132,15 @@ class MonitoringAgents:
 
             if scraped_data.get("error"):
                 logger.error(f"❌ Scraper error: {scraped_data.get('error')}")
+            elif scraped_data.get("not_modified"):
+                state["change_summary"] = "No changes detected (not modified)"
             else:
                 logger.info("✅ Scrape completed successfully")
 
+        except RateLimitTimeout as e:
+            logger.warning(f"⏳ {e}")
+            state["error"] = str(e)
+            state["scraped_data"] = {"error": str(e), "failure": "rate_limited"}
         except Exception as e:
             logger.error(f"❌ Scraper exception: {str(e)}")
             state["error"] = str(e)
@@ -77,6 +148,58 @@ class MonitoringAgents:
 
         return state
 
+    async def _fetch(self, target: MonitoringTarget, spec: ExtractionSpec) -> dict:
+        """Actually scrape ``target`` - runs only on a shared-cache miss
+
+        The host circuit breaker and politeness limiter live here, so cache hits
+        and coalesced checks never touch either.
+        """
+        url = str(target.url)
+        retry_at = await host_circuit_breaker.blocked_until(url)
+        if retry_at:
+            logger.warning(
+                f"🚫 Circuit open for host of {url} - skipping until {retry_at.isoformat()}"
+            )
+            return {
+                "error": "Host circuit open",
+                "circuit_open": True,
+                "retry_at": retry_at,
+            }
+
+        validators = None
+        # A 304 keeps the stored hash, so only trust it when that hash was
+        # computed the way this check would compute it
+        if target.last_content_hash and target.content_hash_scheme == spec.hash_scheme:
+            validators = {
+                "etag": target.http_etag,
+                "last_modified": target.http_last_modified,
+            }
+
+        logger.info(f"🔄 Initiating scraper for URL: {url}")
+        try:
+            async with host_rate_limiter.acquire(url, target.target_type):
+                scraped_data = await self.scraper.ascrape_url(
+                    url,
+                    target.target_type,
+                    validators=validators,
+                    spec=spec,
+                    keep_html=target.debug_capture != "off",
+                )
+        except RateLimitTimeout:
+            raise
+        except Exception:
+            await host_circuit_breaker.record_failure(url)
+            raise
+
+        # Only failures of the host itself (transport errors, timeouts, 5xx,
+        # 429) count against it; a missing page still proves the host is up
+        failure = scraped_data.get("failure")
+        if failure == "host":
+            await host_circuit_breaker.record_failure(url)
+        elif failure != "rate_limited":
+            await host_circuit_breaker.record_success(url)
+        return scraped_data
+
     def _analyze_node(self, state: MonitoringState) -> MonitoringState:
         target = state["target"]
         scraped_data = state["scraped_data"]
@@ -93,18 +216,59 @@ class MonitoringAgents:
 
         current_hash = scraped_data.get("content_hash")
         previous_hash = target.last_content_hash
+        current_scheme = scraped_data.get("hash_scheme")
 
-        logger.info(f"📊 Current hash: {current_hash}")
-        logger.info(f"📊 Previous hash: {previous_hash}")
+        logger.info(f"📊 Current hash: {current_hash} ({current_scheme})")
+        logger.info(f"📊 Previous hash: {previous_hash} ({target.content_hash_scheme})")
 
         if previous_hash is None:
             logger.info("🆕 First scrape - will get AI insights")
             state["has_changes"] = False
             state["change_summary"] = "Initial snapshot - getting AI insights"
+        elif target.content_hash_scheme != current_scheme:
+            # Hashes from different normalization rules can't be compared
+            logger.info(
+                f"🔁 Hash scheme changed ({target.content_hash_scheme} -> {current_scheme})"
+                " - re-baselining without flagging a change"
+            )
+            state["has_changes"] = False
+            state["rebaselined"] = True
+            state["change_summary"] = "Fingerprint scheme changed - re-baselined"
+        elif current_hash != previous_hash and target.section_hashes:
+            # Structured LinkedIn documents: an exact diff of per-section hashes
+            changed = changed_sections(
+                target.section_hashes, scraped_data.get("section_hashes") or {}
+            )
+            state["changed_sections"] = changed
+            if changed:
+                state["change_class"] = "fields"
+                metrics.incr("changes.fields")
+                logger.info(
+                    f"🔄 Changed sections: {', '.join(changed)} - will perform AI analysis"
+                )
+                state["has_changes"] = True
+                state["change_summary"] = f"Changed sections: {', '.join(changed)}"
+            else:
+                logger.info("✅ No section changes detected")
+                state["has_changes"] = False
+                state["change_summary"] = "No changes detected"
         elif current_hash != previous_hash:
-            logger.info("🔄 Hash change detected - will perform AI analysis")
-            state["has_changes"] = True
-            state["change_summary"] = "Content changes detected"
+            change_class, score = self._classify_change(target, scraped_data)
+            state["change_class"] = change_class
+            metrics.incr(f"changes.{change_class}")
+            similarity_note = f" (similarity {score:.2f})" if score is not None else ""
+
+            if change_class == "trivial":
+                logger.info(f"🪶 Trivial change{similarity_note} - skipping AI analysis")
+                state["has_changes"] = False
+                state["change_summary"] = f"Trivial change{similarity_note}"
+            else:
+                logger.info(
+                    f"🔄 {change_class.title()} change{similarity_note}"
+                    " - will perform AI analysis"
+                )
+                state["has_changes"] = True
+                state["change_summary"] = "Content changes detected"
         else:
             logger.info("✅ No hash changes detected")
             state["has_changes"] = False
@@ -140,11 +304,29 @@ class MonitoringAgents:
                 else:
                     previous_content = "No previous content available"
 
-                ai_analysis = self.ai_service.analyze_changes(
-                    old_content=previous_content,
-                    new_content=current_content,
-                    target_type=target.target_type
-                )
+                sections = None
+                if state.get("changed_sections") and previous_snapshot:
+                    sections = self._section_contents(
+                        previous_content, scraped_data, state["changed_sections"]
+                    )
+
+                if sections is not None:
+                    logger.info(
+                        f"🧩 Sending only the changed sections: {', '.join(state['changed_sections'])}"
+                    )
+                    ai_analysis = await asyncio.to_thread(
+                        self.ai_service.analyze_changes,
+                        old_content=sections[0],
+                        new_content=sections[1],
+                        target_type=target.target_type
+                    )
+                else:
+                    ai_analysis = await asyncio.to_thread(
+                        self.ai_service.analyze_changes,
+                        old_content=previous_content,
+                        new_content=current_content,
+                        target_type=target.target_type
+                    )
                 
                 state["ai_analysis"] = ai_analysis
                 state["has_changes"] = ai_analysis.get("has_changes", state["has_changes"])
@@ -155,7 +337,8 @@ class MonitoringAgents:
                 
             else:
                 logger.info("📊 Extracting AI insights from content")
-                ai_insights = self.ai_service.extract_profile_insights(
+                ai_insights = await asyncio.to_thread(
+                    self.ai_service.extract_profile_insights,
                     content=current_content,
                     target_type=target.target_type
                 )
@@ -203,19 +386,8 @@ class MonitoringAgents:
                 if (email_notifications_enabled and email_on_changes and 
                     ai_analysis.get("importance_score", 0) >= min_importance):
                     
-                    logger.info(f"📧 Sending change email to {user.email}")
-                    email_sent = await self.email_service.send_change_notification(
-                        to_email=user.email,
-                        target_url=str(target.url),
-                        ai_analysis=ai_analysis,
-                        target_type=target.target_type,
-                        user_name=user.full_name
-                    )
-                    
-                    if email_sent:
-                        logger.info("✅ Change notification email sent successfully")
-                    else:
-                        logger.warning("⚠️ Failed to send change notification email")
+                    logger.info(f"📧 Queueing change email to {user.email}")
+                    self._queue_email("change", user, target, ai_analysis)
                 else:
                     logger.info("ℹ️ Email notification skipped (disabled or low importance)")
                 
@@ -258,19 +430,8 @@ class MonitoringAgents:
             
             # Email insights notification
             if email_notifications_enabled and email_on_insights:
-                logger.info(f"📧 Sending insights email to {user.email}")
-                email_sent = await self.email_service.send_insights_notification(
-                    to_email=user.email,
-                    target_url=str(target.url),
-                    ai_insights=ai_insights,
-                    target_type=target.target_type,
-                    user_name=user.full_name
-                )
-                
-                if email_sent:
-                    logger.info("✅ Insights email sent successfully")
-                else:
-                    logger.warning("⚠️ Failed to send insights email")
+                logger.info(f"📧 Queueing insights email to {user.email}")
+                self._queue_email("insights", user, target, ai_insights)
             else:
                 logger.info("ℹ️ Insights email notification skipped (disabled)")
         else:
@@ -278,6 +439,37 @@ class MonitoringAgents:
 
         return state
 
+    def _queue_email(
+        self, kind: str, user: User, target: MonitoringTarget, payload: dict
+    ) -> None:
+        """Hand the email to the notify queue so SMTP never blocks a check"""
+        try:
+            celery_app.send_task(
+                "app.modules.monitoring.tasks.send_notification_email",
+                kwargs={
+                    "kind": kind,
+                    "to_email": user.email,
+                    "target_url": str(target.url),
+                    "payload": payload,
+                    "target_type": target.target_type,
+                    "user_name": user.full_name,
+                },
+            )
+            logger.info(f"✅ {kind.title()} email queued")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to queue {kind} email: {e}")
+
+    def _section_contents(self, previous_content: str, scraped_data: dict, names: list):
+        """Old and new JSON of just the changed sections, or None if unavailable"""
+        try:
+            previous = json.loads(previous_content)
+        except ValueError:
+            return None
+        current = scraped_data.get("sections") or {}
+        if not isinstance(previous, dict):
+            return None
+        return sections_text(previous, names), sections_text(current, names)
+
     def _generate_summary(self, target: MonitoringTarget, new_data: dict) -> str:
         return f"Content updated on {target.target_type} at {target.url}"
 
@@ -287,6 +479,10 @@ class MonitoringAgents:
             f"📋 Target details - ID: {target.id}, Type: {target.target_type}, User: {target.user_id}"
         )
 
+        # Only fields this check changes are written back, so concurrent API
+        # edits and the lease survive the final save
+        before = target.model_dump()
+
         # Get user for email notifications
         user = await User.get(target.user_id)
         if not user:
@@ -297,6 +493,9 @@ class MonitoringAgents:
             target=target,
             scraped_data={},
             has_changes=False,
+            rebaselined=False,
+            change_class="",
+            changed_sections=[],
             change_summary="",
             ai_analysis={},
             ai_insights={},
@@ -312,10 +511,57 @@ class MonitoringAgents:
         )
 
         # Update target and save snapshots
-        if result["scraped_data"]:
+        scraped_data = result["scraped_data"]
+        if scraped_data.get("circuit_open"):
+            target.next_check_at = scraped_data["retry_at"]
+            await target.save_fields(*target.changed_fields(before))
+            logger.info(
+                f"⏭️  Host circuit open - next check at {target.next_check_at.isoformat()}"
+            )
+        elif scraped_data.get("failure") in _NOT_TARGET_FAILURES:
+            # Our own budget ran out, or the URL isn't an HTML page - neither
+            # says the target is failing, so retry on schedule without backoff
+            target.last_error = result.get("error")
+            target.last_checked = datetime.utcnow()
+            target.next_check_at = compute_next_check_at(target, target.last_checked)
+            await target.save_fields(*target.changed_fields(before))
+            logger.warning(
+                f"⏳ Check skipped ({scraped_data['failure']}) - "
+                f"next check at {target.next_check_at.isoformat()}"
+            )
+        elif result.get("error") or not scraped_data:
+            target.consecutive_failures += 1
+            target.last_error = result.get("error") or "No data scraped"
+            target.last_checked = datetime.utcnow()
+            target.next_check_at = compute_next_check_at(target, target.last_checked)
+            await target.save_fields(*target.changed_fields(before))
+            logger.warning(
+                f"⚠️  Check failed ({target.consecutive_failures} in a row) - "
+                f"backing off until {target.next_check_at.isoformat()}"
+            )
+        else:
             logger.info("💾 Updating target with new data...")
-            target.last_content_hash = result["scraped_data"].get("content_hash")
+            target.consecutive_failures = 0
+            target.last_error = None
+            if scraped_data.get("not_modified"):
+                target.http_etag = scraped_data.get("etag") or target.http_etag
+                target.http_last_modified = (
+                    scraped_data.get("last_modified") or target.http_last_modified
+                )
+            else:
+                target.last_content_hash = scraped_data.get("content_hash")
+                target.content_hash_scheme = scraped_data.get("hash_scheme")
+                # Trivial changes keep the old similarity baseline, so a run of
+                # small edits still adds up to a reportable change
+                if result.get("change_class") != "trivial":
+                    target.last_simhash = scraped_data.get("simhash")
+                target.section_hashes = scraped_data.get("section_hashes") or {}
+                target.http_etag = scraped_data.get("etag")
+                target.http_last_modified = scraped_data.get("last_modified")
             target.last_checked = datetime.utcnow()
+            if result["has_changes"]:
+                record_change(target, target.last_checked)
+            target.next_check_at = compute_next_check_at(target, target.last_checked)
             
             snapshot_id = None
             if target.target_type in ["linkedin_profile", "linkedin_company"]:
@@ -325,8 +571,10 @@ class MonitoringAgents:
                     user_id=target.user_id,
                     target_type=target.target_type,
                     url=str(target.url),
-                    content=result["scraped_data"].get("content", ""),
-                    content_hash=result["scraped_data"].get("content_hash", ""),
+                    content=scraped_data.get("content", ""),
+                    content_hash=scraped_data.get("content_hash", ""),
+                    simhash=scraped_data.get("simhash"),
+                    section_hashes=scraped_data.get("section_hashes") or {},
                     previous_snapshot_id=target.latest_snapshot_id,
                 )
                 await snapshot.insert()
@@ -334,7 +582,7 @@ class MonitoringAgents:
                 target.latest_snapshot_id = snapshot_id
                 logger.info(f"✅ Snapshot saved with ID: {snapshot_id}")
             
-            await target.save()
+            await target.save_fields(*target.changed_fields(before))
             logger.info("✅ Target updated successfully")
 
             if result["has_changes"]:
@@ -350,11 +598,39 @@ class MonitoringAgents:
                 )
                 await change.save()
                 logger.info("✅ Change detection record saved")
-        else:
-            logger.warning("⚠️  No scraped data to save - skipping target update")
+
+        self._capture(target, result)
 
         logger.info(f"🏁 Monitoring workflow completed for {target.url}")
         return result
+
+    def _capture(self, target: MonitoringTarget, result: dict) -> None:
+        """Hand the page to the background debug writer if the target opted in"""
+        scraped_data = result["scraped_data"]
+        reason = capture_reason(
+            target.debug_capture,
+            error=bool(result.get("error")),
+            changed=bool(result.get("has_changes")),
+        )
+        if reason is None or scraped_data.get("circuit_open"):
+            return
+
+        debug_capture.submit(
+            Capture(
+                target_id=str(target.id),
+                url=str(target.url),
+                target_type=target.target_type,
+                reason=reason,
+                # LinkedIn and shared-cache results only have the extracted text
+                html=scraped_data.pop("raw_html", None)
+                or scraped_data.get("content", ""),
+                details={
+                    "error": result.get("error"),
+                    "content_hash": scraped_data.get("content_hash"),
+                    "change_summary": result.get("change_summary"),
+                },
+            )
+        )
     
     def cleanup(self):
         logger.info("🧹 Cleaning up monitoring agent resources")
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+import asyncio
+import logging
+import threading
+import time
+
+from app.core.metrics import metrics
+from .driver_pool import linkedin_driver_pool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BrowserExecutor:
+    """Dedicated threads for blocking Selenium scrapes
+
+    Browser scrapes block for tens of seconds, so they run here and are awaited
+    from the graph while the loop keeps serving other targets' HTTP fetches,
+    database writes and emails. Keeping them off the loop's default executor
+    means they can't starve ``asyncio.to_thread`` users either.
+
+    The pool has one thread per pooled driver: extra scrapes queue here instead
+    of holding a thread while they wait on a driver checkout.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    size = linkedin_driver_pool.size
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=size, thread_name_prefix="browser-scrape"
+                    )
+                    logger.info(f"🧵 Browser scrape executor started ({size} threads)")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Await ``func(*args)`` on a browser thread"""
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), func, *args
+            )
+        finally:
+            metrics.observe("browser.scrape", time.perf_counter() - started)
+
+    def shutdown(self) -> None:
+        """Drop queued scrapes and wait for the running ones to return their drivers"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            logger.info("🧹 Browser scrape executor stopped")
+
+
+browser_executor = BrowserExecutor()
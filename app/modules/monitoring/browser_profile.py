@@ -0,0 +1,85 @@
+from typing import Optional
+import logging
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# "standard" is full desktop Chrome; "lightweight" trades rendering fidelity
+# (which the scraper never looks at) for load time, bandwidth and memory
+BROWSER_PROFILES = ("standard", "lightweight")
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Requests the lightweight profile never lets out: images, media, fonts and
+# analytics/ad beacons. Patterns use Network.setBlockedURLs wildcard syntax.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.ogg",
+    "*media.licdn.com/dms/image*",
+    "*media.licdn.com/playlist*",
+    "*linkedin.com/li/track*",
+    "*px.ads.linkedin.com*",
+    "*snap.licdn.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*bat.bing.com*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+]
+
+# 2 = block for these content settings
+_LIGHTWEIGHT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "profile.default_content_setting_values.geolocation": 2,
+}
+
+
+def chrome_options(profile: Optional[str] = None) -> ChromeOptions:
+    """Chrome options for a ``LINKEDIN_BROWSER_PROFILE``"""
+    profile = profile or settings.LINKEDIN_BROWSER_PROFILE
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(
+            f"Unknown browser profile '{profile}' (expected one of {', '.join(BROWSER_PROFILES)})"
+        )
+
+    options = ChromeOptions()
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-web-security")
+    options.add_argument("--disable-features=VizDisplayCompositor")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-agent={USER_AGENT}")
+
+    if profile == "lightweight":
+        options.add_argument("--headless=new")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_experimental_option("prefs", _LIGHTWEIGHT_PREFS)
+        # Return once the DOM is parsed; the scraper waits for its own elements
+        options.page_load_strategy = "eager"
+    return options
+
+
+def apply_profile(driver: webdriver.Chrome, profile: Optional[str] = None) -> None:
+    """Per-driver DevTools setup that can't be expressed as launch options"""
+    profile = profile or settings.LINKEDIN_BROWSER_PROFILE
+    if profile != "lightweight":
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    except Exception as e:
+        # Prefs still keep images out; only fonts, media and trackers slip through
+        logger.warning(f"⚠️ Could not install request blocking: {e}")
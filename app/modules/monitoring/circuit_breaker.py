@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Optional
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from .urls import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+# Count a failure and open (or re-open, when the failure was a half-open probe)
+# the circuit; every opening doubles the cooldown up to the configured maximum.
+_RECORD_FAILURE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local threshold = tonumber(ARGV[1])
+local base = tonumber(ARGV[2])
+local max_cooldown = tonumber(ARGV[3])
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+local opened_until = tonumber(redis.call('HGET', KEYS[1], 'opened_until') or '0')
+local half_open = opened_until > 0 and now >= opened_until
+local opened = 0
+if half_open or (opened_until == 0 and failures >= threshold) then
+    local opens = redis.call('HINCRBY', KEYS[1], 'opens', 1)
+    local cooldown = math.min(base * 2 ^ (opens - 1), max_cooldown)
+    redis.call('HSET', KEYS[1], 'opened_until', tostring(now + cooldown))
+    redis.call('DEL', KEYS[2])
+    opened = 1
+end
+redis.call('EXPIRE', KEYS[1], max_cooldown * 2 + 3600)
+return opened
+"""
+
+
+class HostCircuitBreaker:
+    """Per-host circuit breaker shared through Redis
+
+    Closed until ``CIRCUIT_FAILURE_THRESHOLD`` consecutive scrape failures on a
+    registrable domain, then open for a cooldown that doubles on every
+    re-opening. Once the cooldown passes the circuit is half-open: up to
+    ``CIRCUIT_HALF_OPEN_PROBES`` checks go through as probes, and the first
+    outcome closes or re-opens it. Fails open if Redis is unreachable.
+    """
+
+    def _keys(self, url: str):
+        domain = registrable_domain(url)
+        return domain, f"circuit:{domain}", f"circuit:{domain}:probes"
+
+    async def blocked_until(self, url: str) -> Optional[datetime]:
+        """Return when the host may be retried, or ``None`` if the request may go"""
+        domain, key, probes_key = self._keys(url)
+        try:
+            redis = get_redis()
+            opened_until = float(await redis.hget(key, "opened_until") or 0)
+            if not opened_until:
+                return None
+
+            now = time.time()
+            if now < opened_until:
+                metrics.incr("scrape.circuit_open_skips")
+                return datetime.utcfromtimestamp(opened_until)
+
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.incr(probes_key)
+                pipe.expire(probes_key, settings.CIRCUIT_COOLDOWN_SECONDS, nx=True)
+                probes, _ = await pipe.execute()
+            if probes <= settings.CIRCUIT_HALF_OPEN_PROBES:
+                logger.info(f"🩺 Circuit half-open for {domain} - sending probe")
+                return None
+
+            metrics.incr("scrape.circuit_open_skips")
+            return datetime.utcfromtimestamp(now + settings.CIRCUIT_COOLDOWN_SECONDS)
+        except RedisError as e:
+            logger.warning(f"⚠️ Circuit breaker unavailable for {domain}: {e}")
+            return None
+
+    async def record_success(self, url: str) -> None:
+        domain, key, probes_key = self._keys(url)
+        try:
+            if await get_redis().delete(key, probes_key):
+                logger.debug(f"🟢 Circuit reset for {domain}")
+        except RedisError as e:
+            logger.warning(f"⚠️ Circuit breaker unavailable for {domain}: {e}")
+
+    async def record_failure(self, url: str) -> None:
+        domain, key, probes_key = self._keys(url)
+        try:
+            record = get_redis().register_script(_RECORD_FAILURE_SCRIPT)
+            opened = await record(
+                keys=[key, probes_key],
+                args=[
+                    settings.CIRCUIT_FAILURE_THRESHOLD,
+                    settings.CIRCUIT_COOLDOWN_SECONDS,
+                    settings.CIRCUIT_MAX_COOLDOWN_SECONDS,
+                ],
+            )
+            if opened:
+                metrics.incr("scrape.circuit_opened")
+                logger.warning(f"🔴 Circuit opened for {domain}")
+        except RedisError as e:
+            logger.warning(f"⚠️ Circuit breaker unavailable for {domain}: {e}")
+
+
+host_circuit_breaker = HostCircuitBreaker()
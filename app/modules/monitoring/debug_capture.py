@@ -0,0 +1,194 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Per-target ``debug_capture`` modes
+CAPTURE_MODES = ("off", "on_error", "on_change", "sample", "all")
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+_GLOBAL_PRUNE_EVERY = 50
+
+
+@dataclass
+class Capture:
+    """One page to persist for debugging"""
+    target_id: str
+    url: str
+    target_type: str
+    reason: str  # "error", "change", "sample" or "check"
+    html: str = ""
+    details: dict = field(default_factory=dict)
+    captured_at: datetime = field(default_factory=datetime.utcnow)
+
+
+def capture_reason(mode: str, error: bool, changed: bool) -> Optional[str]:
+    """Why a check under ``mode`` should be captured, or None to skip it"""
+    if mode == "off":
+        return None
+    if error:
+        return "error"
+    if changed and mode in ("on_change", "sample", "all"):
+        return "change"
+    if mode == "all":
+        return "check"
+    if mode == "sample" and random.random() < settings.DEBUG_CAPTURE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+class DebugCaptureWriter:
+    """Writes captured pages from a background thread with ring-buffer retention
+
+    ``submit`` never blocks the check: captures go on a bounded queue and are
+    dropped (and counted) when it is full. Files are compressed with zstd when
+    ``zstandard`` is installed, gzip otherwise. Each target keeps its newest
+    ``DEBUG_CAPTURE_MAX_PER_TARGET`` captures, and the capture directory as a
+    whole is trimmed, oldest first, to ``DEBUG_CAPTURE_MAX_BYTES``.
+    """
+
+    def __init__(self):
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _ensure_started(self) -> queue.Queue:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._queue = queue.Queue(maxsize=settings.DEBUG_CAPTURE_QUEUE_SIZE)
+                self._thread = threading.Thread(
+                    target=self._run, name="debug-capture", daemon=True
+                )
+                self._thread.start()
+            return self._queue
+
+    def submit(self, capture: Capture) -> bool:
+        try:
+            self._ensure_started().put_nowait(capture)
+            return True
+        except queue.Full:
+            metrics.incr("debug_capture.dropped")
+            logger.warning(f"⚠️ Debug capture queue full - dropping {capture.url}")
+            return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued captures and stop the writer thread"""
+        with self._lock:
+            thread, pending = self._thread, self._queue
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            pending.put(None)
+            thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        pending = self._queue
+        while True:
+            capture = pending.get()
+            if capture is None:
+                return
+            try:
+                self._write(capture)
+            except Exception as e:
+                logger.warning(
+                    f"⚠️ Could not save debug capture for {capture.url}: {e}"
+                )
+
+    def _compress(self, data: bytes):
+        mode = settings.DEBUG_CAPTURE_COMPRESSION
+        if zstandard is not None and mode in ("auto", "zstd"):
+            return zstandard.ZstdCompressor(level=3).compress(data), ".html.zst"
+        return gzip.compress(data, compresslevel=6), ".html.gz"
+
+    def _write(self, capture: Capture) -> None:
+        target_dir = os.path.join(
+            settings.DEBUG_CAPTURE_DIR, _SAFE_NAME.sub("_", capture.target_id)
+        )
+        os.makedirs(target_dir, exist_ok=True)
+
+        header = {
+            "url": capture.url,
+            "target_type": capture.target_type,
+            "reason": capture.reason,
+            "captured_at": capture.captured_at.isoformat(),
+            **capture.details,
+        }
+        document = f"<!-- capture: {json.dumps(header, default=str)} -->\n"
+        document += capture.html
+        data, suffix = self._compress(document.encode("utf-8"))
+
+        stamp = capture.captured_at.strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(target_dir, f"{stamp}_{capture.reason}{suffix}")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        metrics.incr("debug_capture.written")
+        metrics.incr("debug_capture.bytes", len(data))
+        logger.debug(f"💾 Debug capture saved to: {path} ({len(data)} bytes)")
+
+        self._prune(target_dir, keep=settings.DEBUG_CAPTURE_MAX_PER_TARGET)
+        self._writes += 1
+        if self._writes % _GLOBAL_PRUNE_EVERY == 1:
+            self._prune_total(
+                settings.DEBUG_CAPTURE_DIR, settings.DEBUG_CAPTURE_MAX_BYTES
+            )
+
+    def _prune(self, directory: str, keep: int) -> None:
+        entries = sorted(
+            (
+                entry
+                for entry in os.scandir(directory)
+                if entry.is_file() and not entry.name.endswith(".tmp")
+            ),
+            key=lambda entry: entry.name,
+        )
+        for entry in entries[: max(0, len(entries) - keep)]:
+            self._remove(entry.path)
+
+    def _prune_total(self, root: str, max_bytes: int) -> None:
+        files = []
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+debug_capture = DebugCaptureWriter()
@@ -0,0 +1,217 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+import itertools
+import logging
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from .browser_profile import apply_profile, chrome_options
+from .linkedin_session import linkedin_session_store
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolTimeout(Exception):
+    """No browser became free within the checkout timeout"""
+
+
+class PooledDriver:
+    """A Chrome driver plus the bookkeeping the pool needs"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, driver: webdriver.Chrome, generation: int):
+        self.id = next(self._ids)
+        self.driver = driver
+        self.generation = generation
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.authenticated_at: Optional[float] = None
+        self.uses = 0
+
+
+class LinkedInDriverPool:
+    """Bounded pool of independently authenticated Chrome drivers
+
+    Up to ``LINKEDIN_DRIVER_POOL_SIZE`` drivers are created on demand. A
+    checkout waits up to ``LINKEDIN_DRIVER_CHECKOUT_TIMEOUT`` for one to free
+    up, so one stuck page only ties up its own driver. Drivers are health
+    checked on checkin and quit when broken, worn out
+    (``LINKEDIN_DRIVER_MAX_USES``) or idle for ``LINKEDIN_DRIVER_IDLE_SECONDS``.
+
+    The pool bounds browsers per worker process; the account-wide request budget
+    is still enforced by the LinkedIn politeness limiter.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self._size = size
+        self._idle: List[PooledDriver] = []
+        self._created = 0
+        self._generation = 0
+        self._condition = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+    @property
+    def size(self) -> int:
+        return max(1, self._size or settings.LINKEDIN_DRIVER_POOL_SIZE)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None) -> Iterator[webdriver.Chrome]:
+        """Check a driver out for the duration of the block"""
+        pooled = self.checkout(timeout)
+        try:
+            yield pooled.driver
+        finally:
+            self.checkin(pooled)
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        timeout = settings.LINKEDIN_DRIVER_CHECKOUT_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        started = time.perf_counter()
+        pooled = None
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    pooled = self._idle.pop()  # most recently used first
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.incr("linkedin.driver_checkout_timeout")
+                    raise DriverPoolTimeout(
+                        f"No LinkedIn driver free after {timeout}s "
+                        f"(pool size {self.size})"
+                    )
+                self._condition.wait(remaining)
+
+        metrics.observe("linkedin.driver_checkout_wait", time.perf_counter() - started)
+        if pooled is None:
+            pooled = self._create()
+
+        try:
+            self._ensure_authenticated(pooled)
+        except Exception:
+            self._discard(pooled)
+            raise
+
+        pooled.uses += 1
+        return pooled
+
+    def checkin(self, pooled: PooledDriver) -> None:
+        """Return a driver, quitting it if it is broken or worn out"""
+        if (
+            pooled.generation != self._generation
+            or pooled.uses >= settings.LINKEDIN_DRIVER_MAX_USES
+            or not self._is_healthy(pooled)
+        ):
+            self._discard(pooled)
+            return
+
+        pooled.last_used = time.monotonic()
+        with self._condition:
+            self._idle.append(pooled)
+            self._condition.notify()
+
+    def clear(self) -> None:
+        """Quit every idle driver; busy ones are replaced as they come back"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
+
+    def close(self) -> None:
+        """Quit all drivers; the pool starts afresh on the next checkout"""
+        with self._condition:
+            self._generation += 1
+        self.clear()
+        logger.info("🧹 LinkedIn driver pool closed")
+
+    def _create(self) -> PooledDriver:
+        try:
+            logger.info(f"🚀 Creating Chrome driver ({self._created}/{self.size} in pool)")
+            driver = self._create_driver()
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+        self._start_reaper()
+        metrics.incr("linkedin.driver_created")
+        return PooledDriver(driver, self._generation)
+
+    def _create_driver(self) -> webdriver.Chrome:
+        service = ChromeService(executable_path=settings.CHROME_DRIVER_PATH)
+        driver = webdriver.Chrome(service=service, options=chrome_options())
+        apply_profile(driver)
+        driver.implicitly_wait(10)
+        logger.info(
+            f"✅ Chrome driver created successfully ({settings.LINKEDIN_BROWSER_PROFILE} profile)"
+        )
+        return driver
+
+    def _ensure_authenticated(self, pooled: PooledDriver) -> None:
+        if pooled.authenticated_at is not None:
+            idle_for = time.monotonic() - pooled.last_used
+            if idle_for <= settings.LINKEDIN_SESSION_TIMEOUT_SECONDS:
+                return
+            if linkedin_session_store.validate(pooled.driver):
+                pooled.authenticated_at = time.monotonic()
+                return
+            logger.info(f"🔐 LinkedIn session expired on driver #{pooled.id}")
+
+        how = linkedin_session_store.authenticate(pooled.driver)
+        pooled.authenticated_at = time.monotonic()
+        logger.info(f"✅ LinkedIn driver #{pooled.id} authenticated ({how})")
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            pooled.driver.current_url
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ LinkedIn driver #{pooled.id} failed its health check: {e}")
+            return False
+
+    def _discard(self, pooled: PooledDriver) -> None:
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing LinkedIn driver #{pooled.id}: {e}")
+        finally:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+        logger.info(f"🧹 LinkedIn driver #{pooled.id} closed after {pooled.uses} uses")
+
+    def _start_reaper(self) -> None:
+        with self._condition:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(
+                target=self._reap_idle, name="linkedin-driver-reaper", daemon=True
+            )
+            self._reaper.start()
+
+    def _reap_idle(self) -> None:
+        interval = max(10, settings.LINKEDIN_DRIVER_IDLE_SECONDS // 4)
+        while True:
+            time.sleep(interval)
+            cutoff = time.monotonic() - settings.LINKEDIN_DRIVER_IDLE_SECONDS
+            with self._condition:
+                expired = [p for p in self._idle if p.last_used < cutoff]
+                self._idle = [p for p in self._idle if p.last_used >= cutoff]
+            for pooled in expired:
+                logger.info(f"💤 Evicting idle LinkedIn driver #{pooled.id}")
+                self._discard(pooled)
+
+
+linkedin_driver_pool = LinkedInDriverPool()
@@ -415,4 +415,7 @@ class EmailNotificationService:
             return True
         except Exception as e:
             logger.error(f"❌ SMTP connection test failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+email_service = EmailNotificationService()
@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+import asyncio
+import logging
+import multiprocessing
+import threading
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from .extractor import ExtractionSpec, extract_content
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionPool:
+    """Runs website extraction in worker processes instead of on the event loop
+
+    Parsing is CPU-bound, so concurrent checks in one worker would otherwise
+    serialize on the GIL and stall the loop's Mongo/Redis/HTTP I/O. Only the
+    HTML goes to the child and only the small extraction dict comes back.
+
+    ``EXTRACTION_PROCESS_POOL_SIZE=0`` (the default) keeps extraction inline, as
+    do documents under ``EXTRACTION_INLINE_MAX_BYTES`` - for those the IPC costs
+    more than the parse. Children are spawned rather than forked so they don't
+    inherit the parent's event loop, sockets or Selenium state. If the pool
+    cannot start or breaks, extraction falls back to inline.
+
+    A daemonic process may not have children, so under Celery's default
+    prefork pool the worker must run with ``--pool threads`` or ``--pool solo``
+    for the pool to be used.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self._size = size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        if self._size is not None:
+            return self._size
+        return settings.EXTRACTION_PROCESS_POOL_SIZE
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._disabled or self.size <= 0:
+            return None
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None and not self._disabled:
+                    if multiprocessing.current_process().daemon:
+                        logger.warning(
+                            "⚠️ EXTRACTION_PROCESS_POOL_SIZE is ignored in a daemonic "
+                            "process (Celery prefork child); run the worker with "
+                            "--pool threads or --pool solo. Extracting inline."
+                        )
+                        self._disabled = True
+                        return None
+                    try:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.size,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                        logger.info(
+                            f"🧮 Extraction process pool started ({self.size} workers)"
+                        )
+                    except (OSError, ValueError) as e:
+                        logger.warning(
+                            f"⚠️ Extraction process pool unavailable, extracting inline: {e}"
+                        )
+                        self._disabled = True
+        return self._executor
+
+    async def extract(
+        self, html: str, spec: Optional[ExtractionSpec] = None
+    ) -> Dict[str, str]:
+        """``extract_content`` off the event loop when a pool is configured"""
+        executor = None
+        if len(html) >= settings.EXTRACTION_INLINE_MAX_BYTES:
+            executor = self._get_executor()
+        if executor is None:
+            return extract_content(html, spec)
+
+        try:
+            future = executor.submit(extract_content, html, spec)
+        except (AssertionError, RuntimeError, OSError) as e:
+            # Workers start on the first submit, which is where a daemonic
+            # parent (Celery prefork child) finds it may not have children
+            logger.warning(
+                f"⚠️ Extraction process pool unavailable, extracting inline: {e}"
+            )
+            self._disabled = True
+            self._reset(executor)
+            return extract_content(html, spec)
+
+        try:
+            result = await asyncio.wrap_future(future)
+            metrics.incr("extraction.pooled")
+            return result
+        except BrokenProcessPool as e:
+            logger.warning(f"⚠️ Extraction pool broke, restarting it: {e}")
+            self._reset(executor)
+            return extract_content(html, spec)
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            logger.info("🧹 Extraction process pool stopped")
+
+
+extraction_pool = ExtractionPool()
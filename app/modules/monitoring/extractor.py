@@ -0,0 +1,370 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import re
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml is optional
+    etree = None
+
+from .fingerprint import (
+    compile_rules,
+    fingerprint,
+    hash_scheme,
+    normalize,
+    simhash,
+)
+
+logger = logging.getLogger(__name__)
+
+SKIPPED_TAGS = frozenset({"script", "style", "nav", "footer", "header"})
+# Never hold text, and html.parser reports no end tag for them
+VOID_TAGS = frozenset(
+    {
+        "area", "base", "br", "col", "embed", "hr", "img", "input",
+        "link", "meta", "param", "source", "track", "wbr",
+    }
+)
+MAX_STORED_CONTENT = 10000
+MAX_SELECTORS = 20
+
+_COMPOUND_RE = re.compile(
+    r"(?P<tag>[a-zA-Z][\w-]*|\*)?"
+    r"(?P<rest>(?:[.#][\w-]+|\[[\w-]+(?:=(?:\"[^\"]*\"|'[^']*'|[^\]\"']*))?\])*)"
+)
+_PART_RE = re.compile(
+    r"(?P<kind>[.#])(?P<name>[\w-]+)"
+    r"|\[(?P<attr>[\w-]+)(?:=(?P<value>\"[^\"]*\"|'[^']*'|[^\]\"']*))?\]"
+)
+
+
+@dataclass(frozen=True)
+class _Selector:
+    source: str
+    tag: Optional[str]
+    element_id: Optional[str]
+    classes: Tuple[str, ...]
+    attrs: Tuple[Tuple[str, Optional[str]], ...]
+
+    def matches(self, tag: str, attrib) -> bool:
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.element_id is not None and attrib.get("id") != self.element_id:
+            return False
+        if self.classes:
+            present = (attrib.get("class") or "").split()
+            if any(name not in present for name in self.classes):
+                return False
+        for name, value in self.attrs:
+            if name not in attrib:
+                return False
+            if value is not None and attrib.get(name) != value:
+                return False
+        return True
+
+
+def parse_selector(selector: str) -> _Selector:
+    """Parse a compound selector: ``tag``, ``#id``, ``.class``, ``[attr]``, ``[attr=value]``
+
+    Combinators are not supported - selectors are matched one element at a
+    time while the document streams past.
+    """
+    source = selector.strip()
+    match = _COMPOUND_RE.fullmatch(source)
+    if not source or not match:
+        raise ValueError(
+            f"Unsupported selector '{selector}' - use tag, #id, .class, [attr] "
+            f"or [attr=value], optionally combined (e.g. 'div.article[data-id]')"
+        )
+
+    tag = match.group("tag")
+    element_id = None
+    classes = []
+    attrs = []
+    for part in _PART_RE.finditer(match.group("rest")):
+        if part.group("kind") == "#":
+            element_id = part.group("name")
+        elif part.group("kind") == ".":
+            classes.append(part.group("name"))
+        else:
+            value = part.group("value")
+            if value is not None and value[:1] in ("'", '"'):
+                value = value[1:-1]
+            attrs.append((part.group("attr").lower(), value))
+
+    return _Selector(
+        source=source,
+        tag=None if tag in (None, "*") else tag.lower(),
+        element_id=element_id,
+        classes=tuple(classes),
+        attrs=tuple(attrs),
+    )
+
+
+@lru_cache(maxsize=1024)
+def _compile(selectors: Tuple[str, ...]) -> Tuple[_Selector, ...]:
+    return tuple(parse_selector(selector) for selector in selectors)
+
+
+@dataclass(frozen=True)
+class ExtractionSpec:
+    """Which parts of a page count as its content
+
+    With ``include`` set, only text inside matching elements is kept; text in
+    ``exclude`` matches is always dropped, like script/style/nav/footer/header.
+    ``normalization_rules`` are extra regexes masked out before fingerprinting.
+    """
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = ()
+    normalization_rules: Tuple[str, ...] = ()
+
+    @classmethod
+    def build(
+        cls,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        normalization_rules: Optional[Sequence[str]] = None,
+    ) -> "ExtractionSpec":
+        spec = cls(
+            include=tuple(s.strip() for s in include or () if s.strip()),
+            exclude=tuple(s.strip() for s in exclude or () if s.strip()),
+            normalization_rules=tuple(r for r in normalization_rules or () if r),
+        )
+        spec.validate()
+        return spec
+
+    @classmethod
+    def for_target(cls, target) -> "ExtractionSpec":
+        return cls(
+            include=tuple(target.include_selectors or ()),
+            exclude=tuple(target.exclude_selectors or ()),
+            normalization_rules=tuple(target.normalization_rules or ()),
+        )
+
+    @property
+    def hash_scheme(self) -> str:
+        """Text scheme plus the selectors, which decide what text is hashed"""
+        scheme = hash_scheme(self.normalization_rules)
+        if self.include or self.exclude:
+            selectors = json.dumps([self.include, self.exclude])
+            digest = hashlib.blake2b(selectors.encode(), digest_size=4)
+            scheme = f"{scheme};s{digest.hexdigest()}"
+        return scheme
+
+    def fingerprint(self, text: str) -> str:
+        return fingerprint(text, self.normalization_rules)
+
+    def simhash(self, text: str) -> str:
+        return simhash(text, self.normalization_rules)
+
+    def validate(self) -> None:
+        """Raise ``ValueError`` if any selector or rule is unsupported"""
+        if len(self.include) + len(self.exclude) > MAX_SELECTORS:
+            raise ValueError(f"At most {MAX_SELECTORS} selectors are allowed")
+        _compile(self.include)
+        _compile(self.exclude)
+        compile_rules(self.normalization_rules)
+
+
+DEFAULT_SPEC = ExtractionSpec()
+
+
+class _TextCollector:
+    """Parser target that keeps visible text and the page title
+
+    Text inside ``SKIPPED_TAGS`` and excluded elements is dropped as it streams
+    past, so no tree is ever built. Contiguous text is joined, stripped and kept
+    if non-empty, which matches ``BeautifulSoup.get_text(separator=" ",
+    strip=True)`` after the skipped elements are decomposed.
+    """
+
+    def __init__(self, spec: ExtractionSpec = DEFAULT_SPEC):
+        self.parts: List[str] = []
+        self.title: Optional[str] = None
+        self.matches: Dict[str, int] = {}
+        self._include = _compile(spec.include)
+        self._exclude = _compile(spec.exclude)
+        self._buffer: List[str] = []
+        self._title_parts: Optional[List[str]] = None
+        self._skip_tag: Optional[str] = None
+        self._skip_nesting = 0
+        self._include_tag: Optional[str] = None
+        self._include_nesting = 0
+
+    def _match(self, selectors: Tuple[_Selector, ...], tag, attrib) -> bool:
+        matched = False
+        for selector in selectors:
+            if selector.matches(tag, attrib):
+                self.matches[selector.source] = self.matches.get(selector.source, 0) + 1
+                matched = True
+        return matched
+
+    def start(self, tag, attrib=None):
+        self._flush()
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_nesting += 1
+            return
+
+        if tag in SKIPPED_TAGS or (
+            self._exclude
+            and tag not in VOID_TAGS
+            and self._match(self._exclude, tag, attrib or {})
+        ):
+            self._skip_tag = tag
+            self._skip_nesting = 1
+            return
+
+        if self._include_tag is not None:
+            if tag == self._include_tag:
+                self._include_nesting += 1
+        elif (
+            self._include
+            and tag not in VOID_TAGS
+            and self._match(self._include, tag, attrib or {})
+        ):
+            self._include_tag = tag
+            self._include_nesting = 1
+
+        if tag == "title" and self.title is None and self._title_parts is None:
+            self._title_parts = []
+
+    def end(self, tag):
+        self._flush()
+        if self._skip_tag is not None:
+            if tag == self._skip_tag:
+                self._skip_nesting -= 1
+                if not self._skip_nesting:
+                    self._skip_tag = None
+            return
+        if tag == self._include_tag:
+            self._include_nesting -= 1
+            if not self._include_nesting:
+                self._include_tag = None
+        if tag == "title" and self._title_parts is not None:
+            self.title = "".join(self._title_parts)
+            self._title_parts = None
+
+    def data(self, data):
+        if self._skip_tag is None:
+            self._buffer.append(data)
+
+    def comment(self, text):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        if self._title_parts is not None:
+            self.title = "".join(self._title_parts)
+            self._title_parts = None
+        return self
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer.clear()
+        if self._title_parts is not None:
+            self._title_parts.append(text)
+        if self._include and self._include_tag is None:
+            return
+        stripped = text.strip()
+        if stripped:
+            self.parts.append(stripped)
+
+
+class _StdlibTokenizer(HTMLParser):
+    """Feeds ``html.parser`` events into a collector when lxml is unavailable"""
+
+    def __init__(self, target: _TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, dict(attrs))
+        self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def handle_comment(self, data):
+        self.target.comment(data)
+
+
+def _collect(html: str, spec: ExtractionSpec) -> _TextCollector:
+    if etree is not None:
+        collector = _TextCollector(spec)
+        try:
+            parser = etree.HTMLParser(target=collector)
+            parser.feed(html)
+            return parser.close()
+        except etree.LxmlError as e:
+            logger.warning(f"⚠️  lxml tokenizer failed, falling back to html.parser: {e}")
+
+    collector = _TextCollector(spec)
+    tokenizer = _StdlibTokenizer(collector)
+    tokenizer.feed(html)
+    tokenizer.close()
+    return collector.close()
+
+
+def extract_content(
+    html: str, spec: Optional[ExtractionSpec] = None
+) -> Dict[str, str]:
+    """Extract ``title`` / ``content`` / ``content_hash`` from an HTML document
+
+    ``content_hash`` is the normalized fingerprint of the full text (not just
+    the stored first ``MAX_STORED_CONTENT`` characters) and ``simhash`` its
+    similarity fingerprint; ``hash_scheme`` says how they were computed.
+    """
+    return _extract(html, spec or DEFAULT_SPEC)[0]
+
+
+def preview_extraction(html: str, spec: ExtractionSpec, limit: int = 2000) -> dict:
+    """What ``spec`` captures from ``html``, with per-selector match counts"""
+    result, collector = _extract(html, spec)
+    matches = collector.matches if collector else {}
+    return {
+        "title": result["title"],
+        "content_preview": result["content"][:limit],
+        "normalized_preview": normalize(
+            result["content"][:limit], spec.normalization_rules
+        ),
+        "content_length": len(result["content"]),
+        "content_hash": result["content_hash"],
+        "hash_scheme": result["hash_scheme"],
+        "include_matches": {s: matches.get(s, 0) for s in spec.include},
+        "exclude_matches": {s: matches.get(s, 0) for s in spec.exclude},
+    }
+
+
+def _extract(
+    html: str, spec: ExtractionSpec
+) -> Tuple[Dict[str, str], Optional[_TextCollector]]:
+    collector = None
+    if not html.strip():
+        text, title = "", ""
+    else:
+        collector = _collect(html, spec)
+        text = " ".join(collector.parts)
+        title = collector.title or ""
+
+    result = {
+        "title": title,
+        "content": text[:MAX_STORED_CONTENT],
+        "content_hash": spec.fingerprint(text),
+        "simhash": spec.simhash(text),
+        "hash_scheme": spec.hash_scheme,
+    }
+    return result, collector
@@ -0,0 +1,207 @@
+from typing import Awaitable, Callable, Dict, Optional
+from uuid import uuid4
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from .extractor import ExtractionSpec
+from .linkedin_extractor import document_scheme, fingerprint_document
+from .rate_limiter import LINKEDIN_TARGET_TYPES
+from .urls import canonical_url
+
+logger = logging.getLogger(__name__)
+
+# Delete the coalescing lock only if this worker still holds it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_POLL_SECONDS = 0.5
+
+# Per-check payload that is never worth sharing through Redis
+_UNCACHED_KEYS = {"raw_html"}
+
+
+class FetchCache:
+    """Shares one scrape + extraction between targets watching the same page
+
+    Results are cached in Redis under the canonical URL and extraction spec. A
+    reader accepts an entry no older than ``FETCH_CACHE_MAX_AGE_FRACTION`` of its
+    own check interval, and entries expire after the writer's max age, so the
+    fastest-checking target bounds how long a result lives. Concurrent misses
+    coalesce: in-process on a shared future, across workers on a Redis lock whose
+    holder fetches while the others wait for its result.
+
+    LinkedIn entries ignore normalization rules (the profile text is cached in
+    full) and are re-fingerprinted per reader. If Redis is unreachable every
+    check simply fetches on its own.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def max_age(self, check_frequency: int) -> int:
+        """How stale a cached result may be for a target checked this often"""
+        age = check_frequency * settings.FETCH_CACHE_MAX_AGE_FRACTION
+        return max(1, int(min(age, settings.FETCH_CACHE_MAX_TTL_SECONDS)))
+
+    def _key(self, url: str, target_type: str, spec: ExtractionSpec) -> str:
+        parts = [canonical_url(url), target_type]
+        if target_type not in LINKEDIN_TARGET_TYPES:
+            parts.append(
+                json.dumps([spec.include, spec.exclude, spec.normalization_rules])
+            )
+        digest = hashlib.blake2b("\n".join(parts).encode(), digest_size=16)
+        return f"fetchcache:{digest.hexdigest()}"
+
+    async def get_or_fetch(
+        self,
+        url: str,
+        target_type: str,
+        spec: ExtractionSpec,
+        max_age: int,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Return a fresh enough shared result for ``url``, calling ``fetch`` on a miss"""
+        if not settings.FETCH_CACHE_ENABLED:
+            return await fetch()
+
+        key = self._key(url, target_type, spec)
+        shared = self._inflight.get(key)
+        if shared is not None:
+            result = await asyncio.shield(shared)
+            if result is not None and not result.get("not_modified"):
+                metrics.incr("fetch_cache.coalesced")
+                logger.info(f"🤝 Sharing in-flight fetch of {url}")
+                return self._for_reader(result, spec)
+            # The leader failed or got a 304 for its own validators
+            return await fetch()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._lookup_or_fetch(key, url, max_age, fetch)
+        except BaseException:
+            future.set_result(None)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(result)
+        return self._for_reader(result, spec)
+
+    async def _lookup_or_fetch(
+        self,
+        key: str,
+        url: str,
+        max_age: int,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        cached = await self._read(key, max_age)
+        if cached is not None:
+            metrics.incr("fetch_cache.hit")
+            logger.info(f"♻️  Fetch cache hit for {url}")
+            return cached
+
+        token = await self._lock(key)
+        if token is None:
+            cached = await self._wait_for_leader(key, max_age)
+            if cached is not None:
+                metrics.incr("fetch_cache.coalesced")
+                logger.info(f"🤝 Reusing another worker's fetch of {url}")
+                return cached
+
+        metrics.incr("fetch_cache.miss")
+        try:
+            result = await fetch()
+            if not result.get("error") and not result.get("not_modified"):
+                await self._write(key, result, max_age)
+            return result
+        finally:
+            if token is not None:
+                await self._unlock(key, token)
+
+    def _for_reader(self, result: dict, spec: ExtractionSpec) -> dict:
+        """Copy ``result`` for one target, re-fingerprinting under its rules"""
+        result = dict(result)
+        scheme = result.get("hash_scheme")
+        if result.get("error") or not scheme:
+            return result
+        if "sections" in result:
+            if scheme != document_scheme(spec):
+                fingerprint_document(result, spec)
+        elif scheme != spec.hash_scheme:
+            result["content_hash"] = spec.fingerprint(result.get("content", ""))
+            result["simhash"] = spec.simhash(result.get("content", ""))
+            result["hash_scheme"] = spec.hash_scheme
+        return result
+
+    async def _read(self, key: str, max_age: int) -> Optional[dict]:
+        try:
+            raw = await get_redis().get(key)
+        except RedisError as e:
+            logger.warning(f"⚠️ Fetch cache unavailable: {e}")
+            return None
+        if not raw:
+            return None
+
+        entry = json.loads(raw)
+        if time.time() - entry["fetched_at"] > max_age:
+            return None
+        return entry["result"]
+
+    async def _write(self, key: str, result: dict, max_age: int) -> None:
+        result = {k: v for k, v in result.items() if k not in _UNCACHED_KEYS}
+        entry = {"fetched_at": time.time(), "result": result}
+        try:
+            await get_redis().set(key, json.dumps(entry, default=str), ex=max_age)
+        except RedisError as e:
+            logger.warning(f"⚠️ Could not cache fetch result: {e}")
+
+    async def _lock(self, key: str) -> Optional[str]:
+        token = uuid4().hex
+        try:
+            acquired = await get_redis().set(
+                f"{key}:lock", token, nx=True, ex=settings.FETCH_COALESCE_LOCK_SECONDS
+            )
+        except RedisError as e:
+            logger.warning(f"⚠️ Fetch coalescing unavailable: {e}")
+            return ""  # fetch without a lock
+        return token if acquired else None
+
+    async def _unlock(self, key: str, token: str) -> None:
+        if not token:
+            return
+        try:
+            release = get_redis().register_script(_RELEASE_SCRIPT)
+            await release(keys=[f"{key}:lock"], args=[token])
+        except RedisError as e:
+            logger.warning(f"⚠️ Could not release fetch lock: {e}")
+
+    async def _wait_for_leader(self, key: str, max_age: int) -> Optional[dict]:
+        """Poll until the lock holder publishes its result, gives up or times out"""
+        deadline = time.monotonic() + settings.FETCH_COALESCE_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            cached = await self._read(key, max_age)
+            if cached is not None:
+                return cached
+            try:
+                if not await get_redis().exists(f"{key}:lock"):
+                    return None
+            except RedisError:
+                return None
+        return None
+
+
+fetch_cache = FetchCache()
@@ -0,0 +1,172 @@
+from functools import lru_cache
+from typing import Callable, Match, Pattern, Sequence, Tuple, Union
+import hashlib
+import re
+
+import regex
+
+# Bump whenever BUILTIN_RULES or the digest change; targets hashed under an
+# older scheme are re-baselined instead of being reported as changed.
+HASH_SCHEME_VERSION = 2
+
+MAX_RULES = 20
+MAX_RULE_LENGTH = 200
+# Per substitution; a user rule that backtracks past this fails the check
+RULE_TIMEOUT_SECONDS = 0.25
+
+SIMHASH_BITS = 64
+_SHINGLE_WORDS = 3
+_WORD = re.compile(r"\w+")
+# _BIT_TABLES[k] maps each byte to 1 if its bit k is set, else 0
+_BIT_TABLES = tuple(bytes((b >> k) & 1 for b in range(256)) for k in range(8))
+
+_HAS_DIGIT = re.compile(r"\d")
+_HAS_LETTER = re.compile(r"[A-Za-z]")
+
+
+def _mask_token(match: Match) -> str:
+    # Decided here rather than with lookaheads, which rescan the whole run at
+    # every start position and go quadratic on long [\w-] runs
+    run = match.group()
+    if _HAS_DIGIT.search(run) and _HAS_LETTER.search(run):
+        return "<token>"
+    return run
+
+
+_MONTH = (
+    r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+)
+
+# (name, pattern, replacement), applied in order
+BUILTIN_RULES: Tuple[Tuple[str, Pattern, Union[str, Callable]], ...] = (
+    (
+        "uuid",
+        re.compile(
+            r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"
+        ),
+        "<uuid>",
+    ),
+    # CSRF tokens, nonces, cache busters: long runs mixing letters and digits
+    ("token", re.compile(r"[\w-]{24,}"), _mask_token),
+    ("hex", re.compile(r"\b[0-9a-fA-F]{16,}\b"), "<hex>"),
+    (
+        "iso_datetime",
+        re.compile(
+            r"\b\d{4}-\d{2}-\d{2}"
+            r"(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?\b"
+        ),
+        "<date>",
+    ),
+    ("numeric_date", re.compile(r"\b\d{1,2}[/.]\d{1,2}[/.]\d{2,4}\b"), "<date>"),
+    (
+        "written_date",
+        re.compile(
+            rf"\b(?:{_MONTH}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"
+            rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTH}\s+\d{{4}})\b"
+        ),
+        "<date>",
+    ),
+    (
+        "time",
+        re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp]\.?[Mm]\.?)?(?!\w)"),
+        "<time>",
+    ),
+    (
+        "relative_time",
+        re.compile(
+            r"\b\d+\s*(?:s|sec|second|m|min|minute|h|hr|hour|d|day|w|week|mo|month"
+            r"|y|yr|year)s?\s+ago\b",
+            re.IGNORECASE,
+        ),
+        "<ago>",
+    ),
+    ("whitespace", re.compile(r"\s+"), " "),
+)
+
+
+@lru_cache(maxsize=1024)
+def compile_rules(rules: Tuple[str, ...]) -> Tuple[regex.Pattern, ...]:
+    """Compile user normalization rules, raising ``ValueError`` on bad input
+
+    User rules use the ``regex`` module so each substitution can be given a
+    timeout - a rule that backtracks catastrophically can't stall the worker.
+    """
+    if len(rules) > MAX_RULES:
+        raise ValueError(f"At most {MAX_RULES} normalization rules are allowed")
+
+    compiled = []
+    for rule in rules:
+        if not rule or len(rule) > MAX_RULE_LENGTH:
+            raise ValueError(
+                f"Normalization rules must be 1-{MAX_RULE_LENGTH} characters long"
+            )
+        try:
+            compiled.append(regex.compile(rule))
+        except regex.error as e:
+            raise ValueError(f"Invalid normalization rule '{rule}': {e}")
+    return tuple(compiled)
+
+
+def normalize(text: str, rules: Sequence[str] = ()) -> str:
+    """Mask volatile tokens so they don't register as content changes
+
+    User rules run first and their matches are removed; the built-in rules
+    then mask ids, tokens, dates and times and collapse whitespace.
+    """
+    for pattern in compile_rules(tuple(rules)):
+        try:
+            text = pattern.sub(" ", text, timeout=RULE_TIMEOUT_SECONDS)
+        except TimeoutError:
+            raise ValueError(
+                f"Normalization rule '{pattern.pattern}' took over "
+                f"{RULE_TIMEOUT_SECONDS}s on this page"
+            )
+    for _, pattern, replacement in BUILTIN_RULES:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def fingerprint(text: str, rules: Sequence[str] = ()) -> str:
+    """128-bit BLAKE2b digest of the normalized text"""
+    normalized = normalize(text, rules)
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def simhash(text: str, rules: Sequence[str] = ()) -> str:
+    """64-bit SimHash of the normalized text's word 3-shingles, as hex
+
+    Similar texts get hashes that differ in few bits, so the Hamming distance
+    between two SimHashes estimates how much of a page changed.
+    """
+    words = _WORD.findall(normalize(text, rules).lower())
+    shingle_count = max(1, len(words) - _SHINGLE_WORDS + 1)
+    hashes = b"".join(
+        hashlib.blake2b(
+            " ".join(words[i : i + _SHINGLE_WORDS]).encode(), digest_size=8
+        ).digest()
+        for i in range(shingle_count)
+    )
+
+    # Majority vote per bit, counted a byte column at a time in C
+    value = 0
+    for byte_index in range(SIMHASH_BITS // 8):
+        column = hashes[byte_index::8]
+        for bit, table in enumerate(_BIT_TABLES):
+            if column.translate(table).count(1) * 2 > shingle_count:
+                value |= 1 << (SIMHASH_BITS - 8 * (byte_index + 1) + bit)
+    return f"{value:016x}"
+
+
+def similarity(a: str, b: str) -> float:
+    """Share of matching bits between two ``simhash`` values (1.0 = identical)"""
+    distance = bin(int(a, 16) ^ int(b, 16)).count("1")
+    return 1 - distance / SIMHASH_BITS
+
+
+def hash_scheme(rules: Sequence[str] = ()) -> str:
+    """Identifies how ``fingerprint`` hashed - version plus the user rules"""
+    scheme = f"blake2b-n{HASH_SCHEME_VERSION}"
+    if rules:
+        digest = hashlib.blake2b("\n".join(rules).encode(), digest_size=4)
+        scheme = f"{scheme}:{digest.hexdigest()}"
+    return scheme
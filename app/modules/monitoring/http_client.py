@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+import asyncio
+import codecs
+import importlib.util
+import logging
+import re
+import weakref
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml", "text/plain"}
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_-]+)""", re.I)
+
+
+class ContentRejected(Exception):
+    """Response is not something the website extractor should download"""
+
+
+def failure_kind(status_code: int) -> str:
+    """"host" for statuses that say the server is struggling, else "target"
+
+    Only host failures count towards the host circuit breaker; a 404 or 403
+    is about one page and says nothing about the rest of the domain.
+    """
+    if status_code == 429 or status_code >= 500:
+        return "host"
+    return "target"
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a streamed fetch"""
+    status_code: int
+    url: str
+    headers: httpx.Headers
+    text: str = ""
+    bytes_downloaded: int = 0  # on the wire, before decompression
+    body_bytes: int = 0  # decompressed body bytes actually read
+    truncated: bool = False
+
+
+class HttpFetcher:
+    """Pooled ``httpx.AsyncClient`` shared by every website check in a process
+
+    Connections (and their TLS sessions) are kept alive between checks, so
+    repeated checks of a host skip the handshake. httpx clients are bound to the
+    event loop they were first used on, so one client is kept per loop.
+    """
+
+    def __init__(self):
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _http2_enabled(self) -> bool:
+        if not settings.HTTP_ENABLE_HTTP2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "⚠️ HTTP/2 requested but the 'h2' package is missing - using HTTP/1.1"
+            )
+            return False
+        return True
+
+    def _client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self._http2_enabled(),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS),
+                follow_redirects=True,
+            )
+            self._clients[loop] = client
+            logger.info("🌐 HTTP fetch client created")
+        return client
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+        follow_redirects: bool = True,
+        connect_to: Optional[str] = None,
+    ) -> FetchResult:
+        """Stream ``url`` into text, reading at most ``max_bytes`` of body
+
+        Non-HTML responses are rejected from their headers, before the body is
+        read. The body is decoded incrementally as it arrives and truncated at
+        the cap, whether or not its length was declared; anything past the cap
+        is never downloaded.
+
+        ``connect_to`` pins the connection to an already vetted IP address; the
+        Host header and TLS server name stay those of ``url``. Pinned fetches
+        never follow redirects and use a throwaway client, so a pooled TLS
+        connection to that IP is never reused for a different host name.
+        """
+        if connect_to is None:
+            return await self._fetch(
+                self._client(), url, headers, max_bytes, follow_redirects
+            )
+
+        target = httpx.URL(url)
+        host = f"[{connect_to}]" if ":" in connect_to else connect_to
+        pinned_headers = dict(headers or {})
+        pinned_headers["Host"] = target.netloc.decode("ascii")
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT_SECONDS)
+        ) as client:
+            result = await self._fetch(
+                client,
+                target.copy_with(host=host),
+                pinned_headers,
+                max_bytes,
+                follow_redirects=False,
+                extensions={"sni_hostname": target.raw_host.decode("ascii")},
+            )
+        result.url = url
+        return result
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        url,
+        headers: Optional[Dict[str, str]],
+        max_bytes: Optional[int],
+        follow_redirects: bool,
+        extensions: Optional[dict] = None,
+    ) -> FetchResult:
+        max_bytes = max_bytes or settings.HTTP_MAX_BODY_BYTES
+
+        async with client.stream(
+            "GET",
+            url,
+            headers=headers,
+            follow_redirects=follow_redirects,
+            extensions=extensions,
+        ) as response:
+            result = FetchResult(
+                status_code=response.status_code,
+                url=str(response.url),
+                headers=response.headers,
+            )
+            if not response.is_success:
+                return result
+
+            content_type = response.headers.get("Content-Type", "")
+            mime = content_type.split(";")[0].strip().lower()
+            if mime and mime not in HTML_CONTENT_TYPES:
+                raise ContentRejected(f"Unsupported content type: {mime}")
+
+            decoder = None
+            parts = []
+            async for chunk in response.aiter_bytes():
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(
+                        self._encoding(response, chunk)
+                    )(errors="replace")
+
+                remaining = max_bytes - result.body_bytes
+                if len(chunk) > remaining:
+                    chunk = chunk[:remaining]
+                    result.truncated = True
+
+                result.body_bytes += len(chunk)
+                parts.append(decoder.decode(chunk))
+                if result.truncated:
+                    break
+
+            if decoder is not None:
+                parts.append(decoder.decode(b"", final=True))
+            result.text = "".join(parts)
+            result.bytes_downloaded = response.num_bytes_downloaded
+
+        return result
+
+    def _encoding(self, response: httpx.Response, first_chunk: bytes) -> str:
+        """Charset from the Content-Type header, else a <meta charset>, else UTF-8"""
+        for candidate in (
+            response.charset_encoding,
+            self._sniff_meta_charset(first_chunk),
+        ):
+            if candidate:
+                try:
+                    return codecs.lookup(candidate).name
+                except LookupError:
+                    continue
+        return "utf-8"
+
+    def _sniff_meta_charset(self, chunk: bytes) -> Optional[str]:
+        match = _META_CHARSET.search(chunk[:4096])
+        return match.group(1).decode("ascii") if match else None
+
+    async def aclose(self) -> None:
+        """Close the client bound to the running loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+            logger.info("🔌 HTTP fetch client closed")
+
+
+http_fetcher = HttpFetcher()
@@ -0,0 +1,68 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+import logging
+import os
+import socket
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from .models import MonitoringTarget
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseUnavailable(Exception):
+    """Another worker holds an unexpired lease on the target"""
+
+
+@asynccontextmanager
+async def target_lease(target_id: str) -> AsyncIterator[Optional[MonitoringTarget]]:
+    """Hold an exclusive, expiring claim on a target for the duration of a check
+
+    The claim is a single findAndModify on the target document, which also
+    returns the fresh target. Yields ``None`` when the target doesn't exist and
+    raises ``LeaseUnavailable`` when another worker is already checking it.
+    The TTL only matters if a worker dies mid-check.
+    """
+    object_id = PydanticObjectId(target_id)
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+    now = datetime.utcnow()
+    collection = MonitoringTarget.get_pymongo_collection()
+
+    document = await collection.find_one_and_update(
+        {
+            "_id": object_id,
+            "$or": [
+                {"lease_expires_at": None},
+                {"lease_expires_at": {"$lte": now}},
+            ],
+        },
+        {
+            "$set": {
+                "lease_owner": owner,
+                "lease_expires_at": now
+                + timedelta(seconds=settings.TARGET_LEASE_TTL_SECONDS),
+            }
+        },
+        return_document=ReturnDocument.AFTER,
+    )
+
+    if document is None:
+        if await collection.count_documents({"_id": object_id}, limit=1):
+            raise LeaseUnavailable(target_id)
+        yield None
+        return
+
+    logger.debug(f"🔒 Lease acquired on target {target_id} by {owner}")
+    try:
+        yield MonitoringTarget.model_validate(document)
+    finally:
+        await collection.update_one(
+            {"_id": object_id, "lease_owner": owner},
+            {"$set": {"lease_owner": None, "lease_expires_at": None}},
+        )
+        logger.debug(f"🔓 Lease released on target {target_id}")
@@ -0,0 +1,131 @@
+from typing import Any, Dict, Iterable, List
+import json
+
+from .extractor import ExtractionSpec
+
+# Bump whenever the document layout changes; LinkedIn targets hashed under an
+# older layout are re-baselined instead of being reported as changed.
+DOCUMENT_VERSION = 1
+
+# section name -> attribute on the linkedin_scraper object
+PROFILE_SECTIONS = {
+    "name": "name",
+    "headline": "job_title",
+    "company": "company",
+    "location": "location",
+    "about": "about",
+    "open_to_work": "open_to_work",
+    "experiences": "experiences",
+    "educations": "educations",
+    "skills": "skills",
+    "interests": "interests",
+    "accomplishments": "accomplishments",
+}
+COMPANY_SECTIONS = {
+    "name": "name",
+    "about": "about_us",
+    "website": "website",
+    "phone": "phone",
+    "headquarters": "headquarters",
+    "founded": "founded",
+    "industry": "industry",
+    "company_type": "company_type",
+    "company_size": "company_size",
+    "headcount": "headcount",
+    "specialties": "specialties",
+    "showcase_pages": "showcase_pages",
+    "affiliated_companies": "affiliated_companies",
+}
+
+# Lists whose order LinkedIn doesn't keep stable; experiences and educations
+# keep their (chronological) page order
+_UNORDERED_SECTIONS = {
+    "skills",
+    "interests",
+    "accomplishments",
+    "showcase_pages",
+    "affiliated_companies",
+}
+
+# Derived or per-session values that would flip hashes without a real change,
+# e.g. "duration" ticks over every month
+_VOLATILE_FIELDS = {"driver", "duration"}
+
+
+def _plain(value: Any) -> Any:
+    """JSON-safe copy of a linkedin_scraper value, empty parts dropped"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, (list, tuple, set)):
+        return [item for item in map(_plain, value) if item not in (None, "", [], {})]
+    if isinstance(value, dict):
+        fields = value.items()
+    elif hasattr(value, "__dict__"):
+        fields = vars(value).items()
+    else:
+        return str(value)
+
+    return {
+        str(key): item
+        for key, item in ((key, _plain(item)) for key, item in fields)
+        if not str(key).startswith("_")
+        and key not in _VOLATILE_FIELDS
+        and item not in (None, "", [], {})
+    }
+
+
+def _extract(source: Any, sections: Dict[str, str]) -> Dict[str, Any]:
+    document = {}
+    for section, attribute in sections.items():
+        value = _plain(getattr(source, attribute, None))
+        if value in (None, "", [], {}):
+            continue
+        if section in _UNORDERED_SECTIONS and isinstance(value, list):
+            value = sorted(value, key=canonical_json)
+        document[section] = value
+    return document
+
+
+def extract_person(person: Any) -> Dict[str, Any]:
+    """Structured, stable document of a scraped ``linkedin_scraper.Person``"""
+    return _extract(person, PROFILE_SECTIONS)
+
+
+def extract_company(company: Any) -> Dict[str, Any]:
+    """Structured, stable document of a scraped ``linkedin_scraper.Company``"""
+    return _extract(company, COMPANY_SECTIONS)
+
+
+def canonical_json(value: Any) -> str:
+    """Key-sorted JSON, so equal documents always serialize identically"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, indent=2)
+
+
+def document_scheme(spec: ExtractionSpec) -> str:
+    """``hash_scheme`` of a LinkedIn document - the text scheme plus the layout"""
+    return f"{spec.hash_scheme}+li{DOCUMENT_VERSION}"
+
+
+def fingerprint_document(result: dict, spec: ExtractionSpec) -> dict:
+    """Set the content and per-section hashes of a scraped LinkedIn ``result``"""
+    sections = result.get("sections") or {}
+    result["content_hash"] = spec.fingerprint(result.get("content", ""))
+    result["simhash"] = spec.simhash(result.get("content", ""))
+    result["section_hashes"] = {
+        name: spec.fingerprint(canonical_json(value))
+        for name, value in sections.items()
+    }
+    result["hash_scheme"] = document_scheme(spec)
+    return result
+
+
+def changed_sections(old: Dict[str, str], new: Dict[str, str]) -> List[str]:
+    """Sections added, removed or edited between two ``section_hashes``"""
+    return sorted(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
+
+
+def sections_text(document: Dict[str, Any], names: Iterable[str]) -> str:
+    """Canonical JSON of just the named sections of ``document``"""
+    return canonical_json({name: document.get(name) for name in names})
@@ -0,0 +1,155 @@
+from typing import List, Optional
+import json
+import logging
+import os
+import threading
+
+from linkedin_scraper import actions
+from selenium import webdriver
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LINKEDIN_HOME_URL = "https://www.linkedin.com"
+LINKEDIN_FEED_URL = "https://www.linkedin.com/feed/"
+
+# URL fragments LinkedIn redirects to when a session is not usable
+_LOGIN_WALL_MARKERS = ("/login", "/checkpoint", "/authwall", "/uas/", "/signup")
+_SESSION_COOKIE = "li_at"
+_SAME_SITE_VALUES = ("Strict", "Lax", "None")
+
+
+class LinkedInLoginError(RuntimeError):
+    """The form login ended on a login or checkpoint page"""
+
+
+def on_login_wall(url: str) -> bool:
+    return any(marker in url for marker in _LOGIN_WALL_MARKERS)
+
+
+class LinkedInSessionStore:
+    """Persists LinkedIn session cookies so new drivers can skip the login form
+
+    Cookies are saved to ``LNKDIN_COOKIES_PATH`` after each successful form
+    login. A new driver gets them restored and proves the session by loading
+    the feed; only when that lands on a login or checkpoint page does it fall
+    back to ``actions.login``, which is slow and what trips LinkedIn's
+    verification checks when repeated.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        return self._path or settings.LNKDIN_COOKIES_PATH
+
+    def authenticate(self, driver: webdriver.Chrome) -> str:
+        """Log ``driver`` in, returning "restored" or "login" for how it was done"""
+        if self.restore(driver):
+            metrics.incr("linkedin.session_restored")
+            logger.info("🍪 LinkedIn session restored from saved cookies")
+            return "restored"
+
+        self.login(driver)
+        return "login"
+
+    def restore(self, driver: webdriver.Chrome) -> bool:
+        cookies = self.load()
+        if not cookies:
+            return False
+
+        # Cookies can only be set for the domain the driver is currently on
+        driver.get(LINKEDIN_HOME_URL)
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+
+        if self.validate(driver):
+            return True
+        logger.info("🍪 Saved LinkedIn session is no longer valid")
+        return False
+
+    def validate(self, driver: webdriver.Chrome) -> bool:
+        """Cheap session check: the feed loads without a login redirect"""
+        try:
+            driver.get(LINKEDIN_FEED_URL)
+            if on_login_wall(driver.current_url):
+                return False
+            valid = driver.get_cookie(_SESSION_COOKIE) is not None
+        except Exception as e:
+            logger.warning(f"⚠️ LinkedIn session check failed: {e}")
+            return False
+
+        if valid:
+            metrics.incr("linkedin.session_validated")
+        return valid
+
+    def login(self, driver: webdriver.Chrome) -> None:
+        """Full form login, saving the new session's cookies on success"""
+        logger.info("🔐 Logging in to LinkedIn with credentials")
+        metrics.incr("linkedin.relogin")
+        actions.login(
+            driver=driver,
+            email=settings.LNKDIN_EMAIL,
+            password=settings.LNKDIN_PASSWORD,
+        )
+        if on_login_wall(driver.current_url):
+            raise LinkedInLoginError(
+                f"LinkedIn login did not complete (landed on {driver.current_url})"
+            )
+        self.save(driver.get_cookies())
+
+    def load(self) -> Optional[List[dict]]:
+        try:
+            with open(self.path, "r") as f:
+                cookies = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Could not read LinkedIn cookies from {self.path}: {e}")
+            return None
+
+        if not isinstance(cookies, list):
+            return None
+        return [self._sanitize(cookie) for cookie in cookies if isinstance(cookie, dict)]
+
+    def save(self, cookies: List[dict]) -> None:
+        cookies = [
+            cookie for cookie in cookies
+            if cookie.get("domain", "").endswith("linkedin.com")
+        ]
+        if not any(cookie.get("name") == _SESSION_COOKIE for cookie in cookies):
+            logger.warning("⚠️ No LinkedIn session cookie after login - not saving")
+            return
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            try:
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as f:
+                    json.dump(cookies, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not save LinkedIn cookies to {self.path}: {e}")
+                return
+        logger.info(f"🍪 Saved {len(cookies)} LinkedIn cookies")
+
+    def _sanitize(self, cookie: dict) -> dict:
+        cookie = dict(cookie)
+        if cookie.get("sameSite") not in _SAME_SITE_VALUES:
+            cookie.pop("sameSite", None)
+        if "expiry" in cookie:
+            try:
+                cookie["expiry"] = int(cookie["expiry"])
+            except (TypeError, ValueError):
+                del cookie["expiry"]
+        return cookie
+
+
+linkedin_session_store = LinkedInSessionStore()
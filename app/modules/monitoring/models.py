@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from beanie import Document
 from pydantic import Field, HttpUrl
 
@@ -9,10 +9,29 @@ class MonitoringTarget(Document):
     url: HttpUrl
     target_type: str  # "linkedin_profile", "linkedin_company", "website"
     check_frequency: int = 3600  # seconds (default: 1 hour)
+    adaptive_frequency: bool = False  # learn the interval from observed changes
+    min_check_frequency: Optional[int] = None  # adaptive lower bound (seconds)
+    max_check_frequency: Optional[int] = None  # adaptive upper bound (seconds)
+    change_interval_ewma: Optional[float] = None  # smoothed seconds between changes
+    last_changed_at: Optional[datetime] = None
     is_active: bool = True
     last_checked: Optional[datetime] = None
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    next_check_at: Optional[datetime] = None  # when the target is next due for a check
+    include_selectors: List[str] = Field(default_factory=list)  # only hash these subtrees
+    exclude_selectors: List[str] = Field(default_factory=list)  # drop these (ads, banners)
+    normalization_rules: List[str] = Field(default_factory=list)  # regexes masked before hashing
     last_content_hash: Optional[str] = None
+    content_hash_scheme: Optional[str] = None  # how last_content_hash was computed
+    last_simhash: Optional[str] = None  # similarity baseline of the last analyzed content
+    section_hashes: Dict[str, str] = Field(default_factory=dict)  # LinkedIn, per document section
+    debug_capture: str = "off"  # "off", "on_error", "on_change", "sample", "all"
+    http_etag: Optional[str] = None  # validators for conditional GETs (websites)
+    http_last_modified: Optional[str] = None
     latest_snapshot_id: Optional[str] = None  # ID of latest snapshot (for LinkedIn targets)
+    lease_owner: Optional[str] = None  # worker currently checking this target
+    lease_expires_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
     class Settings:
@@ -21,8 +40,31 @@ class MonitoringTarget(Document):
             "user_id",
             "url",
             [("user_id", 1), ("url", 1)],  # compound index
+            # due-target sweep; _id keeps keyset pagination on the index
+            [("is_active", 1), ("next_check_at", 1), ("_id", 1)],
         ]
 
+    def changed_fields(self, before: dict) -> List[str]:
+        """Fields that differ from ``before`` (an earlier ``model_dump()``)"""
+        return [
+            field
+            for field, value in self.model_dump(exclude={"id"}).items()
+            if before.get(field) != value
+        ]
+
+    async def save_fields(self, *fields: str) -> None:
+        """``$set`` only ``fields`` instead of replacing the whole document
+
+        API edits and checks of a target overlap, and the lease lives on the
+        document, so writing back a full stale copy would undo the other side's
+        changes or resurrect a released lease.
+        """
+        if not fields:
+            return
+        await self.get_pymongo_collection().update_one(
+            {"_id": self.id}, {"$set": self.model_dump(include=set(fields))}
+        )
+
 
 class ChangeDetection(Document):
     """Detected changes log"""
@@ -41,6 +83,7 @@ class ChangeDetection(Document):
             "target_id",
             "user_id",
             [("user_id", 1), ("detected_at", -1)],
+            [("target_id", 1), ("detected_at", -1)],
         ]
 
 
@@ -52,6 +95,8 @@ class Snapshot(Document):
     url: str
     content: str
     content_hash: str
+    simhash: Optional[str] = None  # 64-bit SimHash (hex) for similarity scoring
+    section_hashes: Dict[str, str] = Field(default_factory=dict)
     previous_snapshot_id: Optional[str] = None 
     captured_at: datetime = Field(default_factory=datetime.utcnow)
     
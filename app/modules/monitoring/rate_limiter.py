@@ -0,0 +1,138 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Tuple
+from uuid import uuid4
+import asyncio
+import logging
+import random
+import time
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis_client import get_redis
+from .urls import registrable_domain
+
+logger = logging.getLogger(__name__)
+
+LINKEDIN_TARGET_TYPES = {"linkedin_profile", "linkedin_company"}
+
+# Refill the bucket from Redis' clock and take one token; returns the seconds to
+# wait before a token is available (0 when one was taken).
+_TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return tostring(wait)
+"""
+
+# Take an in-flight slot unless the host is at its cap; slots expire so a
+# crashed worker cannot hold one forever.
+_IN_FLIGHT_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) + 60)
+    return 1
+end
+return 0
+"""
+
+
+class RateLimitTimeout(Exception):
+    """Waited longer than SCRAPE_RATE_LIMIT_MAX_WAIT for a host budget"""
+
+
+class HostRateLimiter:
+    """Token-bucket rate and in-flight cap per registrable domain, shared via Redis
+
+    LinkedIn targets use their own, stricter budget. If Redis is unreachable the
+    limiter fails open rather than stopping every check.
+    """
+
+    def _budget(self, domain: str, target_type: str) -> Tuple[float, int, int]:
+        if target_type in LINKEDIN_TARGET_TYPES or domain == "linkedin.com":
+            return (
+                settings.LINKEDIN_RATE,
+                settings.LINKEDIN_BURST,
+                settings.LINKEDIN_MAX_IN_FLIGHT,
+            )
+        return (
+            settings.SCRAPE_HOST_RATE,
+            settings.SCRAPE_HOST_BURST,
+            settings.SCRAPE_HOST_MAX_IN_FLIGHT,
+        )
+
+    @asynccontextmanager
+    async def acquire(self, url: str, target_type: str) -> AsyncIterator[None]:
+        """Wait for a request token and an in-flight slot for ``url``'s domain"""
+        domain = registrable_domain(url)
+        rate, burst, max_in_flight = self._budget(domain, target_type)
+        slot = uuid4().hex
+        in_flight_key = f"ratelimit:inflight:{domain}"
+        deadline = time.monotonic() + settings.SCRAPE_RATE_LIMIT_MAX_WAIT
+        started = time.perf_counter()
+        redis = None
+
+        try:
+            redis = get_redis()
+            take_token = redis.register_script(_TOKEN_BUCKET_SCRIPT)
+            while True:
+                wait = float(
+                    await take_token(
+                        keys=[f"ratelimit:bucket:{domain}"], args=[rate, burst]
+                    )
+                )
+                if wait <= 0:
+                    break
+                await self._sleep(wait, deadline, domain)
+
+            take_slot = redis.register_script(_IN_FLIGHT_SCRIPT)
+            while not await take_slot(
+                keys=[in_flight_key],
+                args=[max_in_flight, settings.SCRAPE_IN_FLIGHT_TTL_SECONDS, slot],
+            ):
+                await self._sleep(0.25 + random.random() * 0.5, deadline, domain)
+        except RedisError as e:
+            logger.warning(f"⚠️ Rate limiter unavailable, proceeding without it: {e}")
+            redis = None
+
+        waited = time.perf_counter() - started
+        metrics.observe("scrape.rate_limit_wait", waited)
+        if waited >= 1:
+            metrics.incr("scrape.rate_limited")
+            logger.info(f"⏳ Waited {waited:.1f}s for {domain} politeness budget")
+
+        try:
+            yield
+        finally:
+            if redis is not None:
+                try:
+                    await redis.zrem(in_flight_key, slot)
+                except RedisError as e:
+                    logger.warning(
+                        f"⚠️ Could not release in-flight slot for {domain}: {e}"
+                    )
+
+    async def _sleep(self, seconds: float, deadline: float, domain: str) -> None:
+        if time.monotonic() + seconds > deadline:
+            raise RateLimitTimeout(f"Politeness budget for {domain} exhausted")
+        await asyncio.sleep(seconds)
+
+
+host_rate_limiter = HostRateLimiter()
@@ -0,0 +1,183 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
+import logging
+import random
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from .models import ChangeDetection, MonitoringTarget
+
+logger = logging.getLogger(__name__)
+
+
+class DueTarget(BaseModel):
+    """Projection of a due target - only what the sweep needs"""
+    id: PydanticObjectId = Field(alias="_id")
+    target_type: str
+    next_check_at: datetime
+
+
+class ChangeTime(BaseModel):
+    """Projection of a ChangeDetection's timestamp"""
+    detected_at: datetime
+
+
+def effective_check_frequency(target: MonitoringTarget, now: datetime) -> int:
+    """Seconds between checks, learned from changes when adaptive mode is on
+
+    The expected change interval is the EWMA of past inter-change times, or the
+    time since the last change if the page has been quiet for longer than that.
+    Checks are spaced at ``ADAPTIVE_SAMPLING_FACTOR`` of it, clamped to the
+    target's bounds.
+    """
+    if not target.adaptive_frequency or target.change_interval_ewma is None:
+        return target.check_frequency
+
+    lower = target.min_check_frequency or target.check_frequency
+    upper = target.max_check_frequency or max(
+        lower, target.check_frequency * settings.ADAPTIVE_MAX_STRETCH
+    )
+
+    expected = target.change_interval_ewma
+    if target.last_changed_at is not None:
+        expected = max(expected, (now - target.last_changed_at).total_seconds())
+
+    interval = expected * settings.ADAPTIVE_SAMPLING_FACTOR
+    return int(min(max(interval, lower), upper))
+
+
+def compute_next_check_at(
+    target: MonitoringTarget, checked_at: Optional[datetime] = None
+) -> datetime:
+    """Return when ``target`` is next due, counting from ``checked_at``
+
+    Targets whose recent checks failed are backed off exponentially.
+    """
+    if checked_at is None:
+        return datetime.utcnow()
+
+    interval = effective_check_frequency(target, checked_at)
+    if target.consecutive_failures:
+        # Exponential backoff, jittered so a dead host's targets spread out
+        backoff = interval * 2 ** min(target.consecutive_failures, 16)
+        interval = max(interval, min(backoff, settings.FAILURE_BACKOFF_MAX_SECONDS))
+        interval *= random.uniform(0.9, 1.1)
+
+    return checked_at + timedelta(seconds=interval)
+
+
+def record_change(target: MonitoringTarget, changed_at: datetime) -> None:
+    """Fold a detected change into the target's change-interval EWMA"""
+    if target.last_changed_at is not None:
+        interval = (changed_at - target.last_changed_at).total_seconds()
+        if target.change_interval_ewma is None:
+            target.change_interval_ewma = interval
+        else:
+            alpha = settings.ADAPTIVE_EWMA_ALPHA
+            target.change_interval_ewma = (
+                alpha * interval + (1 - alpha) * target.change_interval_ewma
+            )
+    target.last_changed_at = changed_at
+
+
+async def learn_change_history(target: MonitoringTarget) -> None:
+    """Seed the change-interval EWMA from recent ChangeDetection history"""
+    detections = (
+        await ChangeDetection.find(ChangeDetection.target_id == str(target.id))
+        .sort(-ChangeDetection.detected_at)
+        .limit(settings.ADAPTIVE_HISTORY_SIZE)
+        .project(ChangeTime)
+        .to_list()
+    )
+
+    target.change_interval_ewma = None
+    target.last_changed_at = None
+    for detection in reversed(detections):
+        record_change(target, detection.detected_at)
+
+
+async def backfill_next_check_at(now: datetime) -> int:
+    """Schedule active targets that predate ``next_check_at``
+
+    Runs as a single server-side update on the sweep index, so it is a no-op
+    once every active target has been scheduled.
+    """
+    result = await MonitoringTarget.get_pymongo_collection().update_many(
+        {"is_active": True, "next_check_at": None},
+        [
+            {
+                "$set": {
+                    "next_check_at": {
+                        "$ifNull": [
+                            {
+                                "$add": [
+                                    "$last_checked",
+                                    {"$multiply": ["$check_frequency", 1000]},
+                                ]
+                            },
+                            now,
+                        ]
+                    }
+                }
+            }
+        ],
+    )
+    if result.modified_count:
+        logger.info(f"🗓️  Backfilled next_check_at for {result.modified_count} targets")
+    return result.modified_count
+
+
+async def claim_due_targets(target_ids: List[PydanticObjectId], now: datetime) -> None:
+    """Push dispatched targets out of the due window until their check lands
+
+    Prevents the next sweep from enqueueing the same targets again while their
+    tasks are still queued; the check itself sets the real ``next_check_at``.
+    """
+    await MonitoringTarget.get_pymongo_collection().update_many(
+        {"_id": {"$in": target_ids}, "next_check_at": {"$lte": now}},
+        {
+            "$set": {
+                "next_check_at": now
+                + timedelta(seconds=settings.SWEEP_DISPATCH_GRACE_SECONDS)
+            }
+        },
+    )
+
+
+async def iter_due_targets(
+    now: datetime, page_size: Optional[int] = None
+) -> AsyncIterator[List[DueTarget]]:
+    """Yield pages of targets due at ``now``, oldest first
+
+    Pages are keyset-paginated on ``(next_check_at, _id)`` so every page is a
+    bounded range scan on the ``(is_active, next_check_at, _id)`` index.
+    """
+    page_size = page_size or settings.SWEEP_PAGE_SIZE
+    cursor = None
+
+    while True:
+        query = {"is_active": True, "next_check_at": {"$lte": now}}
+        if cursor is not None:
+            last_at, last_id = cursor
+            query["$or"] = [
+                {"next_check_at": {"$gt": last_at}},
+                {"next_check_at": last_at, "_id": {"$gt": last_id}},
+            ]
+
+        page = (
+            await MonitoringTarget.find(query)
+            .sort([("next_check_at", 1), ("_id", 1)])
+            .limit(page_size)
+            .project(DueTarget)
+            .to_list()
+        )
+        if not page:
+            return
+
+        yield page
+
+        if len(page) < page_size:
+            return
+        cursor = (page[-1].next_check_at, page[-1].id)
@@ -1,10 +1,14 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict
-import hashlib
+import httpx
+from typing import Dict, Optional
 import logging
-import os
-from datetime import datetime
+import threading
+from app.core.metrics import metrics
+from app.core.config import settings
+from .browser_executor import browser_executor
+from .extraction_pool import extraction_pool
+from .extractor import ExtractionSpec
+from .http_client import DEFAULT_HEADERS, ContentRejected, failure_kind, http_fetcher
+from .linkedin_extractor import fingerprint_document
 from .linkedin_service import LinkedInService
 
 logger = logging.getLogger(__name__)
@@ -13,133 +17,171 @@ logger = logging.getLogger(__name__)
 class ScraperService:
 
     def __init__(self):
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-        }
+        self.headers = dict(DEFAULT_HEADERS)
         self.linkedin_service = None
+        self._linkedin_lock = threading.Lock()
     
     def _get_linkedin_service(self):
         if self.linkedin_service is None:
-            logger.info("🔗 Initializing LinkedIn service")
-            self.linkedin_service = LinkedInService()
+            with self._linkedin_lock:
+                if self.linkedin_service is None:
+                    logger.info("🔗 Initializing LinkedIn service")
+                    self.linkedin_service = LinkedInService()
         return self.linkedin_service
 
-    def scrape_url(self, url: str, target_type: str) -> Dict[str, str]:
+    def scrape_url(
+        self, url: str, target_type: str, spec: Optional[ExtractionSpec] = None
+    ) -> Dict[str, str]:
+        """Blocking LinkedIn scrape; websites go through ``ascrape_url``"""
         logger.info(f"🌐 Starting scrape for URL: {url} (type: {target_type})")
 
         if target_type == "linkedin_profile":
             logger.info("🔗 Using LinkedIn service for profile scraping")
-            return self._get_linkedin_service().scrape_profile(url)
+            result = self._get_linkedin_service().scrape_profile(url)
+            return self._fingerprint(result, spec)
         elif target_type == "linkedin_company":
             logger.info("🔗 Using LinkedIn service for company scraping")
-            return self._get_linkedin_service().scrape_company(url)
+            result = self._get_linkedin_service().scrape_company(url)
+            return self._fingerprint(result, spec)
+
+        raise ValueError(f"scrape_url only handles LinkedIn targets, not '{target_type}'")
+
+    def _fingerprint(
+        self, result: Dict[str, str], spec: Optional[ExtractionSpec]
+    ) -> Dict[str, str]:
+        """Replace the LinkedIn service's raw hash with normalized per-section hashes"""
+        if result.get("error"):
+            return result
+        return fingerprint_document(result, spec or ExtractionSpec())
+
+    async def ascrape_url(
+        self,
+        url: str,
+        target_type: str,
+        validators: Optional[Dict[str, Optional[str]]] = None,
+        spec: Optional[ExtractionSpec] = None,
+        keep_html: bool = False,
+    ) -> Dict[str, str]:
+        """Awaitable ``scrape_url``; website checks share the pooled HTTP client
+
+        ``validators`` (``etag`` / ``last_modified`` from the previous check) turn
+        website fetches into conditional GETs; a 304 comes back as
+        ``{"not_modified": True}`` without parsing or hashing anything.
+        ``spec`` carries the target's selectors and normalization rules.
+        ``keep_html`` returns the raw page as ``raw_html`` for debug captures.
+        """
+        if target_type in ("linkedin_profile", "linkedin_company"):
+            return await browser_executor.run(self.scrape_url, url, target_type, spec)
+
+        logger.info(f"🌐 Starting async scrape for URL: {url} (type: {target_type})")
+        headers = dict(self.headers)
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
 
-        logger.info("🌐 Using regular HTTP scraping")
-        return self._scrape_regular_website(url, target_type)
-
-    def _scrape_regular_website(self, url: str, target_type: str) -> Dict[str, str]:
         try:
             logger.info(f"📡 Making HTTP request to {url}")
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            logger.info(
-                f"✅ HTTP request successful - Status: {response.status_code}, Content-Length: {len(response.content)}"
-            )
+            response = await http_fetcher.fetch(url, headers=headers)
 
-            html_preview = (
-                response.text[:1000].replace("\n", "\\n").replace("\r", "\\r")
-            )
-            logger.debug(f"🔍 Raw HTML preview (first 1000 chars): {html_preview}")
-            logger.debug(f"📄 Response headers: {dict(response.headers)}")
-            logger.debug(f"🌐 Final URL after redirects: {response.url}")
-
-            self._save_debug_html(url, response.text, target_type)
-
-            parsers = ["lxml", "html.parser", "html5lib"]
-            soup = None
-
-            for parser in parsers:
-                try:
-                    logger.info(f"🔍 Trying parser: {parser}")
-                    soup = BeautifulSoup(response.content, parser)
-                    logger.info(f"✅ Successfully parsed with {parser}")
-                    break
-                except Exception as e:
-                    logger.warning(f"⚠️  Parser {parser} failed: {e}")
-                    continue
-
-            if soup is None:
-                logger.error("❌ All parsers failed")
+            if response.status_code == 304:
+                logger.info("♻️  304 Not Modified - skipping download and parse")
+                metrics.incr("scrape.not_modified")
                 return {
-                    "error": "Failed to parse HTML with any available parser",
+                    "not_modified": True,
                     "content": "",
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
                 }
 
-            return self._extract_website_content(soup)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code} for url '{response.url}'"
+                logger.error(f"❌ Scraping failed: {error}")
+                return {
+                    "error": error,
+                    "content": "",
+                    "failure": failure_kind(response.status_code),
+                }
+            if response.truncated:
+                logger.warning(
+                    f"✂️  Body truncated at {response.body_bytes} bytes "
+                    f"(HTTP_MAX_BODY_BYTES={settings.HTTP_MAX_BODY_BYTES})"
+                )
 
-        except Exception as e:
-            logger.error(f"❌ Scraping failed: {str(e)}")
-            return {"error": str(e), "content": ""}
+            self._log_response(
+                url,
+                target_type,
+                response.status_code,
+                response.text,
+                response.headers,
+                response.url,
+            )
+            logger.info("🔍 Extracting generic website content")
+            result = await extraction_pool.extract(response.text, spec)
+            self._log_extraction(result, spec)
 
-    def _extract_website_content(self, soup: BeautifulSoup) -> Dict[str, str]:
-        logger.info("🔍 Extracting generic website content")
+            bytes_used = len(result.get("content", "").encode())
+            metrics.incr("scrape.bytes_downloaded", response.bytes_downloaded)
+            metrics.incr("scrape.bytes_used", bytes_used)
+            logger.info(
+                f"📦 Downloaded {response.bytes_downloaded} bytes "
+                f"({response.body_bytes} decoded), kept {bytes_used} bytes of content"
+            )
 
-        for element in soup(["script", "style", "nav", "footer", "header"]):
-            element.decompose()
+            result["etag"] = response.headers.get("ETag")
+            result["last_modified"] = response.headers.get("Last-Modified")
+            if keep_html:
+                result["raw_html"] = response.text
+            return result
+        except ContentRejected as e:
+            logger.warning(f"🚫 Skipping download: {e}")
+            return {"error": str(e), "content": "", "failure": "rejected"}
+        except httpx.TransportError as e:
+            # Connection failures and timeouts say the host itself is unwell
+            logger.error(f"❌ Scraping failed: {str(e)}")
+            return {
+                "error": str(e) or type(e).__name__,
+                "content": "",
+                "failure": "host",
+            }
+        except Exception as e:
+            logger.error(f"❌ Scraping failed: {str(e)}")
+            return {"error": str(e), "content": "", "failure": "target"}
+
+    def _log_response(
+        self,
+        url: str,
+        target_type: str,
+        status_code: int,
+        text: str,
+        headers,
+        final_url,
+    ) -> None:
+        logger.info(
+            f"✅ HTTP request successful - Status: {status_code}, Length: {len(text)} chars"
+        )
 
-        title = soup.find("title")
-        title_text = title.get_text() if title else ""
-        logger.info(f"📄 Page title: {title_text[:100]}...")
+        html_preview = text[:1000].replace("\n", "\\n").replace("\r", "\\r")
+        logger.debug(f"🔍 Raw HTML preview (first 1000 chars): {html_preview}")
+        logger.debug(f"📄 Response headers: {dict(headers)}")
+        logger.debug(f"🌐 Final URL after redirects: {final_url}")
 
-        # Get main content
-        text = soup.get_text(separator=" ", strip=True)
-        logger.info(f"📝 Extracted text length: {len(text)} characters")
+    def _log_extraction(
+        self, result: Dict[str, str], spec: Optional[ExtractionSpec]
+    ) -> None:
+        if spec and (spec.include or spec.exclude):
+            logger.info(
+                f"🎯 Selectors - include: {list(spec.include)}, exclude: {list(spec.exclude)}"
+            )
+        logger.info(f"📄 Page title: {result['title'][:100]}...")
+        logger.info(f"📝 Extracted text length: {len(result['content'])} characters")
 
-        content_preview = text[:500].replace("\n", "\\n").replace("\r", "\\r")
+        content_preview = (
+            result["content"][:500].replace("\n", "\\n").replace("\r", "\\r")
+        )
         logger.debug(f"📋 Extracted text preview (first 500 chars): {content_preview}")
 
-        logger.debug(f"🏷️  Found {len(soup.find_all('div'))} div elements")
-        logger.debug(f"🏷️  Found {len(soup.find_all('h1'))} h1 elements")
-        logger.debug(f"🏷️  Found {len(soup.find_all('h2'))} h2 elements")
-        logger.debug(f"🏷️  Found {len(soup.find_all('p'))} paragraph elements")
-
-        result = {
-            "title": title_text,
-            "content": text[:10000],
-            "content_hash": self._hash_content(text),
-        }
         logger.info(
             f"✅ Website content extraction completed - hash: {result['content_hash']}"
         )
-        return result
-
-    def _hash_content(self, content: str) -> str:
-        return hashlib.md5(content.encode()).hexdigest()
-
-    def _save_debug_html(self, url: str, html_content: str, target_type: str) -> None:
-        try:
-            if logger.isEnabledFor(logging.DEBUG):
-                debug_dir = "debug_html"
-                os.makedirs(debug_dir, exist_ok=True)
-
-                safe_url = (
-                    url.replace("://", "_")
-                    .replace("/", "_")
-                    .replace("?", "_")
-                    .replace("&", "_")
-                )
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = (
-                    f"{debug_dir}/scraped_{target_type}_{safe_url}_{timestamp}.html"
-                )
-
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(html_content)
-
-                logger.debug(f"💾 Debug HTML saved to: {filename}")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not save debug HTML: {e}")
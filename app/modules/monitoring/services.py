@@ -1,14 +1,36 @@
+from datetime import datetime
 from typing import List, Optional
+from urllib.parse import urljoin
 from bson import ObjectId
+from .circuit_breaker import host_circuit_breaker
+from .debug_capture import CAPTURE_MODES
+from .extractor import ExtractionSpec, preview_extraction
+from .http_client import DEFAULT_HEADERS, ContentRejected, http_fetcher
 from .models import MonitoringTarget, ChangeDetection, Snapshot
+from .rate_limiter import host_rate_limiter
+from .scheduling import compute_next_check_at, learn_change_history
+from .urls import ensure_public_url
 from app.core.celery_app import celery_app
 
+_PREVIEW_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
 
 class MonitoringService:
 
     @staticmethod
     async def create_target(
-        user_id: str, url: str, target_type: str, check_frequency: int = 3600
+        user_id: str,
+        url: str,
+        target_type: str,
+        check_frequency: int = 3600,
+        adaptive_frequency: bool = False,
+        min_check_frequency: Optional[int] = None,
+        max_check_frequency: Optional[int] = None,
+        include_selectors: Optional[List[str]] = None,
+        exclude_selectors: Optional[List[str]] = None,
+        normalization_rules: Optional[List[str]] = None,
+        debug_capture: str = "off",
     ) -> MonitoringTarget:
 
         existing = await MonitoringTarget.find_one(
@@ -23,8 +45,18 @@ class MonitoringService:
             url=url,
             target_type=target_type,
             check_frequency=check_frequency,
+            adaptive_frequency=adaptive_frequency,
+            min_check_frequency=min_check_frequency,
+            max_check_frequency=max_check_frequency,
+            include_selectors=include_selectors or [],
+            exclude_selectors=exclude_selectors or [],
+            normalization_rules=normalization_rules or [],
+            debug_capture=debug_capture,
             is_active=True,
+            next_check_at=datetime.utcnow(),
         )
+        MonitoringService._validate_frequency_bounds(target)
+        MonitoringService._validate_extraction(target)
 
         await target.insert()
 
@@ -32,6 +64,7 @@ class MonitoringService:
             celery_app.send_task(
                 "app.modules.monitoring.tasks.check_single_target",
                 args=[str(target.id)],
+                kwargs={"target_type": target.target_type},
             )
         except Exception as e:
             print(
@@ -40,6 +73,32 @@ class MonitoringService:
 
         return target
 
+    @staticmethod
+    def _validate_frequency_bounds(target: MonitoringTarget) -> None:
+        if (
+            target.min_check_frequency is not None
+            and target.max_check_frequency is not None
+            and target.min_check_frequency > target.max_check_frequency
+        ):
+            raise ValueError("min_check_frequency cannot exceed max_check_frequency")
+
+    @staticmethod
+    def _validate_extraction(target: MonitoringTarget) -> None:
+        spec = ExtractionSpec.build(
+            target.include_selectors,
+            target.exclude_selectors,
+            target.normalization_rules,
+        )
+        if (spec.include or spec.exclude) and target.target_type != "website":
+            raise ValueError("Selectors are only supported for website targets")
+        target.include_selectors = list(spec.include)
+        target.exclude_selectors = list(spec.exclude)
+        target.normalization_rules = list(spec.normalization_rules)
+        if target.debug_capture not in CAPTURE_MODES:
+            raise ValueError(
+                f"debug_capture must be one of: {', '.join(CAPTURE_MODES)}"
+            )
+
     @staticmethod
     async def get_user_targets(user_id: str) -> List[MonitoringTarget]:
         targets = await MonitoringTarget.find(
@@ -63,12 +122,41 @@ class MonitoringService:
         if not target or target.user_id != user_id:
             return None
 
-        allowed_fields = {"check_frequency", "is_active"}
+        allowed_fields = {
+            "check_frequency",
+            "is_active",
+            "adaptive_frequency",
+            "min_check_frequency",
+            "max_check_frequency",
+            "include_selectors",
+            "exclude_selectors",
+            "normalization_rules",
+            "debug_capture",
+        }
+        before = target.model_dump()
+        was_adaptive = target.adaptive_frequency
+        previous_selectors = (target.include_selectors, target.exclude_selectors)
+        previous_rules = list(target.normalization_rules)
         for key, value in updates.items():
             if key in allowed_fields:
                 setattr(target, key, value)
 
-        await target.save()
+        MonitoringService._validate_frequency_bounds(target)
+        MonitoringService._validate_extraction(target)
+        if (
+            (target.include_selectors, target.exclude_selectors) != previous_selectors
+            or target.normalization_rules != previous_rules
+        ):
+            # Both are part of the hash scheme, so the next check re-baselines
+            # quietly; drop the validators so it isn't answered with a 304
+            target.http_etag = None
+            target.http_last_modified = None
+        if target.adaptive_frequency and not was_adaptive:
+            await learn_change_history(target)
+
+        target.next_check_at = compute_next_check_at(target, target.last_checked)
+
+        await target.save_fields(*target.changed_fields(before))
         return target
 
     @staticmethod
@@ -114,10 +202,14 @@ class MonitoringService:
 
         if not target or target.user_id != user_id:
             return {"error": "Target not found"}
+        if not target.is_active:
+            return {"error": "Target is paused", "target_id": target_id}
 
         try:
             celery_app.send_task(
-                "app.modules.monitoring.tasks.check_single_target", args=[target_id]
+                "app.modules.monitoring.tasks.check_single_target",
+                args=[target_id],
+                kwargs={"target_type": target.target_type},
             )
             return {"message": "Check triggered", "target_id": target_id}
         except Exception as e:
@@ -126,6 +218,52 @@ class MonitoringService:
                 "target_id": target_id,
             }
 
+    @staticmethod
+    async def preview_selectors(
+        url: str,
+        include_selectors: Optional[List[str]] = None,
+        exclude_selectors: Optional[List[str]] = None,
+        normalization_rules: Optional[List[str]] = None,
+    ) -> dict:
+        """Fetch ``url`` once and show what the selectors would capture
+
+        The URL is user supplied, so every hop must resolve to a public address
+        and is fetched from exactly the address that was checked. The fetch
+        obeys the same host breaker and politeness budget as checks.
+        """
+        spec = ExtractionSpec.build(
+            include_selectors, exclude_selectors, normalization_rules
+        )
+        for _ in range(_PREVIEW_MAX_REDIRECTS + 1):
+            address = await ensure_public_url(url)
+            retry_at = await host_circuit_breaker.blocked_until(url)
+            if retry_at:
+                raise ValueError(
+                    f"Host of '{url}' is failing - retry after {retry_at.isoformat()}"
+                )
+            try:
+                async with host_rate_limiter.acquire(url, "website"):
+                    response = await http_fetcher.fetch(
+                        url, headers=DEFAULT_HEADERS, connect_to=address
+                    )
+            except ContentRejected as e:
+                raise ValueError(str(e))
+
+            location = response.headers.get("Location")
+            if response.status_code not in _REDIRECT_STATUSES or not location:
+                break
+            url = urljoin(response.url, location)
+        else:
+            raise ValueError(f"Too many redirects for url '{url}'")
+
+        if response.status_code >= 400:
+            raise ValueError(f"HTTP {response.status_code} for url '{response.url}'")
+
+        preview = preview_extraction(response.text, spec)
+        preview["url"] = str(response.url)
+        preview["truncated"] = response.truncated
+        return preview
+
     @staticmethod
     async def get_target_snapshots(target_id: str, limit: int = 10) -> List[Snapshot]:
         snapshots = await Snapshot.find(
@@ -0,0 +1,125 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from .agents import MonitoringAgents
+from .lease import LeaseUnavailable, target_lease
+from .scheduling import DueTarget, claim_due_targets, iter_due_targets
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrentSweep:
+    """Runs due targets' workflows in-process, bounded per target_type
+
+    Each target_type gets its own semaphore sized from ``SWEEP_CONCURRENCY``,
+    so network-bound website checks can overlap heavily while browser-backed
+    LinkedIn checks stay at one or two at a time.
+    """
+
+    def __init__(
+        self,
+        agents: MonitoringAgents,
+        concurrency: Optional[Dict[str, int]] = None,
+    ):
+        self.agents = agents
+        self.concurrency = concurrency or settings.SWEEP_CONCURRENCY
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._failed: Dict[str, int] = defaultdict(int)
+        self._changed: Dict[str, int] = defaultdict(int)
+        self._skipped: Dict[str, int] = defaultdict(int)
+
+    def _semaphore(self, target_type: str) -> asyncio.Semaphore:
+        if target_type not in self._semaphores:
+            limit = self.concurrency.get(
+                target_type, settings.SWEEP_DEFAULT_CONCURRENCY
+            )
+            self._semaphores[target_type] = asyncio.Semaphore(max(1, limit))
+        return self._semaphores[target_type]
+
+    async def _check(self, due: DueTarget) -> None:
+        async with self._semaphore(due.target_type):
+            started = time.perf_counter()
+            try:
+                async with target_lease(str(due.id)) as target:
+                    if not target or not target.is_active:
+                        return
+                    result = await self.agents.monitor_target(target)
+
+                metrics.incr("targets.checked")
+                if result.get("error"):
+                    self._failed[due.target_type] += 1
+                elif result.get("has_changes"):
+                    self._changed[due.target_type] += 1
+            except LeaseUnavailable:
+                logger.info(f"⏭️  Target {due.id} is already being checked - skipping")
+                metrics.incr("targets.skipped_duplicate")
+                self._skipped[due.target_type] += 1
+                return
+            except Exception as e:
+                logger.error(f"❌ Error checking target {due.id}: {e}")
+                self._failed[due.target_type] += 1
+            self._durations[due.target_type].append(time.perf_counter() - started)
+
+    async def run(self, now: datetime) -> dict:
+        """Check every target due at ``now`` and return throughput statistics"""
+        started = time.perf_counter()
+        page_size = settings.SWEEP_PAGE_SIZE
+        pending = set()
+
+        async for page in iter_due_targets(now, page_size):
+            await claim_due_targets([due.id for due in page], now)
+            pending.update(asyncio.create_task(self._check(due)) for due in page)
+
+            # Keep at most two pages of workflows in memory at once
+            while len(pending) >= page_size:
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+
+        if pending:
+            await asyncio.wait(pending)
+
+        stats = self._stats(time.perf_counter() - started)
+        logger.info(
+            f"📈 Concurrent sweep checked {stats['checked']} targets in "
+            f"{stats['elapsed_seconds']}s ({stats['targets_per_second']} targets/s)"
+        )
+        for target_type, type_stats in stats["by_type"].items():
+            logger.info(f"📈   {target_type}: {type_stats}")
+        return stats
+
+    def _stats(self, elapsed: float) -> dict:
+        by_type = {}
+        for target_type, durations in self._durations.items():
+            ordered = sorted(durations)
+            by_type[target_type] = {
+                "checked": len(ordered),
+                "changed": self._changed[target_type],
+                "failed": self._failed[target_type],
+                "skipped": self._skipped[target_type],
+                "concurrency": self.concurrency.get(
+                    target_type, settings.SWEEP_DEFAULT_CONCURRENCY
+                ),
+                "p50_seconds": round(ordered[len(ordered) // 2], 3),
+                "p95_seconds": round(ordered[int(len(ordered) * 0.95)], 3),
+                "max_seconds": round(ordered[-1], 3),
+            }
+
+        checked = sum(len(durations) for durations in self._durations.values())
+        return {
+            "mode": "concurrent",
+            "checked": checked,
+            "changed": sum(self._changed.values()),
+            "failed": sum(self._failed.values()),
+            "skipped": sum(self._skipped.values()),
+            "elapsed_seconds": round(elapsed, 3),
+            "targets_per_second": round(checked / elapsed, 3) if elapsed else 0.0,
+            "by_type": by_type,
+        }
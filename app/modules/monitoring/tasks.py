@@ -1,9 +1,17 @@
-from celery import shared_task
-from app.core.db import database
-from app.modules.monitoring.models import MonitoringTarget
-from app.modules.monitoring.agents import MonitoringAgents
-from datetime import datetime, timedelta
-import asyncio
+from celery import group, shared_task
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.runtime import runtime
+from app.modules.monitoring.lease import LeaseUnavailable, target_lease
+from app.modules.monitoring.scheduling import (
+    backfill_next_check_at,
+    claim_due_targets,
+    iter_due_targets,
+)
+from app.modules.monitoring.sweep import ConcurrentSweep
+from app.modules.monitoring.email_service import email_service
+from datetime import datetime
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,63 +19,119 @@ logger = logging.getLogger(__name__)
 
 @shared_task(name="app.modules.monitoring.tasks.check_all_targets")
 def check_all_targets():
-    return asyncio.run(_check_all_targets_async())
+    return runtime.run(_check_all_targets_async())
 
 
 async def _check_all_targets_async():
-    await database.connect()
+    """Fan due targets out as check_single_target tasks and return immediately
 
-    agents = MonitoringAgents()
+    With ``SWEEP_MODE="concurrent"`` the due targets are instead checked in this
+    worker with bounded per-type concurrency.
+    """
+    now = datetime.utcnow()
+    await backfill_next_check_at(now)
 
-    targets = await MonitoringTarget.find({"is_active": True}).to_list()
+    if settings.SWEEP_MODE == "concurrent":
+        return await ConcurrentSweep(runtime.agents).run(now)
 
-    checked_count = 0
-    for target in targets:
-        if (
-            target.last_checked is None
-            or (datetime.utcnow() - target.last_checked).total_seconds()
-            >= target.check_frequency
-        ):
-            try:
-                await agents.monitor_target(target)
-                checked_count += 1
-            except Exception as e:
-                print(f"Error checking target {target.url}: {e}")
+    batch_size = settings.SWEEP_BATCH_SIZE
+    dispatched = 0
+    batches = 0
+    async for page in iter_due_targets(now):
+        await claim_due_targets([due.id for due in page], now)
 
-    print(f"✅ Checked {checked_count} targets")
-    return checked_count
+        for start in range(0, len(page), batch_size):
+            chunk = page[start : start + batch_size]
+            group(
+                check_single_target.s(
+                    str(due.id), target_type=due.target_type
+                ).set(expires=settings.SWEEP_DISPATCH_GRACE_SECONDS)
+                for due in chunk
+            ).apply_async()
+            batches += 1
+
+        dispatched += len(page)
+
+    logger.info(f"📤 Dispatched {dispatched} due targets in {batches} batches")
+    return {"dispatched": dispatched, "batches": batches}
 
 
 @shared_task(name="app.modules.monitoring.tasks.check_single_target")
-def check_single_target(target_id: str):
+def check_single_target(target_id: str, target_type: Optional[str] = None):
+    # target_type is only read by the task router to pick the scrape queue
     logger.info(f"🎯 Starting single target check for ID: {target_id}")
-    result = asyncio.run(_check_single_target_async(target_id))
+    result = runtime.run(_check_single_target_async(target_id))
     logger.info(f"✅ Single target check completed. Result: {result}")
     return result
 
 
 async def _check_single_target_async(target_id: str):
     """Async function to check single target"""
-    logger.info(f"🔍 Connecting to database for target: {target_id}")
-    await database.connect()
-
-    logger.info(f"📋 Fetching target from database: {target_id}")
-    target = await MonitoringTarget.get(target_id)
-    if not target:
-        logger.error(f"❌ Target not found: {target_id}")
-        return {"error": "Target not found", "target_id": target_id}
-
-    logger.info(f"🤖 Starting monitoring agents for target: {target.url}")
-    agents = MonitoringAgents()
-    result = await agents.monitor_target(target)
+    logger.info(f"📋 Claiming target for check: {target_id}")
+    try:
+        async with target_lease(target_id) as target:
+            if not target:
+                logger.error(f"❌ Target not found: {target_id}")
+                return {"error": "Target not found", "target_id": target_id}
+            if not target.is_active:
+                # Paused or deleted while the task sat in the queue
+                logger.info(f"⏸️  Target {target_id} is inactive - skipping")
+                return {"target_id": target_id, "checked": False, "skipped": "inactive"}
+
+            logger.info(f"🤖 Starting monitoring agents for target: {target.url}")
+            result = await runtime.agents.monitor_target(target)
+    except LeaseUnavailable:
+        logger.info(f"⏭️  Target {target_id} is already being checked - skipping")
+        metrics.incr("targets.skipped_duplicate")
+        return {"target_id": target_id, "checked": False, "skipped": "lease_held"}
+
+    metrics.incr("targets.checked")
 
     final_result = {
         "target_id": target_id,
         "checked": True,
         "has_changes": result.get("has_changes", False),
+        "change_class": result.get("change_class") or None,
+        "changed_sections": result.get("changed_sections") or [],
         "error": result.get("error"),
         "change_summary": result.get("change_summary", ""),
     }
 
     logger.info(f"📊 Task result: {final_result}")
     return final_result
+
+
+@shared_task(name="app.modules.monitoring.tasks.send_notification_email")
+def send_notification_email(
+    kind: str,
+    to_email: str,
+    target_url: str,
+    payload: dict,
+    target_type: str,
+    user_name: str = "User",
+):
+    """Send a change or insights email off the scrape path"""
+
+    async def send() -> bool:
+        if kind == "change":
+            sent = await email_service.send_change_notification(
+                to_email=to_email,
+                target_url=target_url,
+                ai_analysis=payload,
+                target_type=target_type,
+                user_name=user_name,
+            )
+        else:
+            sent = await email_service.send_insights_notification(
+                to_email=to_email,
+                target_url=target_url,
+                ai_insights=payload,
+                target_type=target_type,
+                user_name=user_name,
+            )
+        # Counted inside the run so this task's flush includes it
+        metrics.incr("emails.sent" if sent else "emails.failed")
+        return sent
+
+    sent = runtime.run(send())
+    return {"kind": kind, "to_email": to_email, "sent": sent}
@@ -0,0 +1,91 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import asyncio
+import ipaddress
+import socket
+
+import tldextract
+
+# Public Suffix List, including the private section (github.io, herokuapp.com)
+# so tenants of shared hosts get their own budgets. Only the snapshot bundled
+# with tldextract is used - no network fetch from inside a worker.
+_suffix_list = tldextract.TLDExtract(
+    suffix_list_urls=(), cache_dir=None, include_psl_private_domains=True
+)
+
+
+def registrable_domain(url: str) -> str:
+    """Return the registrable domain of ``url`` (``www.bbc.co.uk`` -> ``bbc.co.uk``)
+
+    Hosts without a known public suffix (intranet names, bare suffixes) are
+    returned whole rather than guessed at.
+    """
+    host = (urlsplit(url).hostname or "").lower().rstrip(".")
+    if not host or ":" in host or host.replace(".", "").isdigit():
+        return host  # empty or an IP address
+
+    parts = _suffix_list(host)
+    if not parts.suffix or not parts.domain:
+        return host
+    return f"{parts.domain}.{parts.suffix}"
+
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref_src"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Normalize ``url`` so equivalent spellings of a page share one key
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query. LinkedIn pages ignore their
+    query string and trailing slash entirely.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower().rstrip(".")
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or "/"
+    if registrable_domain(url) == "linkedin.com":
+        return urlunsplit((scheme, host, path.rstrip("/") or "/", "", ""))
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_")
+            and key.lower() not in _TRACKING_PARAMS
+        )
+    )
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+async def ensure_public_url(url: str) -> str:
+    """Raise ``ValueError`` unless ``url`` is http(s) and resolves only to public IPs
+
+    Guards user-triggered fetches against reaching loopback, private,
+    link-local (e.g. cloud metadata) or otherwise non-global addresses.
+    Returns the vetted address; connect to it (``HttpFetcher.fetch``'s
+    ``connect_to``) so a second lookup can't be rebound to a private one.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in _DEFAULT_PORTS or not parts.hostname:
+        raise ValueError(f"Only http(s) URLs can be fetched: '{url}'")
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            parts.hostname,
+            parts.port or _DEFAULT_PORTS[parts.scheme],
+            type=socket.SOCK_STREAM,
+        )
+    except socket.gaierror:
+        raise ValueError(f"Could not resolve host '{parts.hostname}'")
+
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"Host '{parts.hostname}' resolves to a non-public address")
+    return infos[0][4][0].split("%")[0]
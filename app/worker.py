@@ -1,7 +1,28 @@
 """
 Celery worker entry point
 Run with: celery -A app.worker.celery_app worker --loglevel=info
+
+Dedicated per-queue workers pick up their concurrency and prefetch settings
+from CELERY_QUEUE_CONCURRENCY / CELERY_QUEUE_PREFETCH:
+CELERY_WORKER_QUEUE=scrape.browser celery -A app.worker.celery_app worker --loglevel=info
 """
+from celery.signals import celeryd_init
+
 from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.runtime import runtime
+
+__all__ = ['celery_app', 'runtime']
+
+
+@celeryd_init.connect
+def _select_worker_queue(sender=None, instance=None, conf=None, options=None, **kwargs):
+    queue = settings.CELERY_WORKER_QUEUE
+    if not queue:
+        return
 
-__all__ = ['celery_app']
\ No newline at end of file
+    # ``options`` is a copy, so consume from the queue on the app itself;
+    # setup_queues leaves this selection alone unless -Q was given.
+    # Concurrency and prefetch are applied in app.core.celery_app.
+    if not options.get("queues"):
+        instance.app.amqp.queues.select([queue])
@@ -0,0 +1,149 @@
+"""
+Website content extraction: BeautifulSoup pipeline vs the streaming extractor.
+
+Runs both over a corpus of saved pages (``debug_html/`` by default, where
+targets with ``debug_capture`` enabled leave compressed captures; ``.html``,
+``.html.gz`` and ``.html.zst`` files are read recursively) and reports per-page timings plus how many pages produced the
+same title and content under both. With ``--processes`` it also measures
+throughput of concurrent extraction through the process pool at 1..N workers.
+
+Run with: python -m benchmarks.extraction --corpus debug_html --repeat 5 --processes 4
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import statistics
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.modules.monitoring.extraction_pool import ExtractionPool
+from app.modules.monitoring.extractor import extract_content
+
+
+def _legacy_extract(html):
+    # The pre-extractor ScraperService pipeline, debug find_all passes included
+    soup = None
+    for parser in ["lxml", "html.parser", "html5lib"]:
+        try:
+            soup = BeautifulSoup(html, parser)
+            break
+        except Exception:
+            continue
+
+    for element in soup(["script", "style", "nav", "footer", "header"]):
+        element.decompose()
+
+    title = soup.find("title")
+    title_text = title.get_text() if title else ""
+    text = soup.get_text(separator=" ", strip=True)
+    for tag in ("div", "h1", "h2", "p"):
+        len(soup.find_all(tag))
+
+    return {
+        "title": title_text,
+        "content": text[:10000],
+        "content_hash": hashlib.md5(text.encode()).hexdigest(),
+    }
+
+
+def _load_corpus(corpus):
+    pages = []
+    for path in sorted(Path(corpus).rglob("*")):
+        if path.name.endswith(".html.gz"):
+            data = gzip.decompress(path.read_bytes())
+        elif path.name.endswith(".html.zst"):
+            import zstandard
+
+            data = zstandard.ZstdDecompressor().decompressobj().decompress(
+                path.read_bytes()
+            )
+        elif path.suffix == ".html":
+            data = path.read_bytes()
+        else:
+            continue
+        pages.append((str(path.relative_to(corpus)), data.decode("utf-8", "replace")))
+    return pages
+
+
+def _measure(label, fn, pages, repeat):
+    samples = []
+    for _ in range(repeat):
+        for _, html in pages:
+            started = time.perf_counter()
+            fn(html)
+            samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    total = sum(samples) / repeat
+    print(
+        f"{label:<14} mean={statistics.mean(samples):8.2f}ms "
+        f"p50={samples[len(samples) // 2]:8.2f}ms "
+        f"p95={samples[int(len(samples) * 0.95)]:8.2f}ms "
+        f"corpus={total:9.1f}ms"
+    )
+    return total
+
+
+async def _extract_all(pool, pages, repeat):
+    await asyncio.gather(
+        *(pool.extract(html) for _ in range(repeat) for _, html in pages)
+    )
+
+
+def _measure_scaling(pages, repeat, max_processes):
+    inline = None
+    for size in range(0, max_processes + 1):
+        pool = ExtractionPool(size=size)
+        try:
+            if size:
+                # Spawn the children before timing
+                asyncio.run(_extract_all(pool, pages[:size], 1))
+            started = time.perf_counter()
+            asyncio.run(_extract_all(pool, pages, repeat))
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.shutdown()
+
+        rate = len(pages) * repeat / elapsed
+        inline = inline or rate
+        label = f"{size} processes" if size else "inline"
+        print(f"{label:<14} {rate:9.1f} pages/s  ({rate / inline:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default="debug_html")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = _load_corpus(args.corpus)
+    if not pages:
+        raise SystemExit(f"No .html or .html.gz pages found in {args.corpus}")
+    size = sum(len(html) for _, html in pages)
+    print(f"{len(pages)} pages, {size / 1024 / 1024:.1f} MiB of HTML\n")
+
+    legacy = _measure("beautifulsoup", _legacy_extract, pages, args.repeat)
+    streaming = _measure("streaming", extract_content, pages, args.repeat)
+    print(f"\nspeedup: {legacy / streaming:.1f}x")
+
+    mismatched = []
+    for name, html in pages:
+        old, new = _legacy_extract(html), extract_content(html)
+        if (old["title"], old["content"]) != (new["title"], new["content"]):
+            mismatched.append(name)
+    print(f"identical title/content: {len(pages) - len(mismatched)}/{len(pages)}")
+    for name in mismatched:
+        print(f"  differs: {name}")
+
+    if args.processes:
+        print()
+        _measure_scaling(pages, args.repeat, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+LinkedIn browser profiles: standard vs lightweight Chrome.
+
+Loads each URL ``--repeat`` times in a fresh driver per profile and reports
+page-load time, bytes transferred (summed from the DevTools performance log's
+``Network.loadingFinished`` events) and the resident memory of chromedriver
+plus every Chrome process it started (from ``/proc``, so Linux only). Saved
+session cookies from ``LNKDIN_COOKIES_PATH`` are restored first when present so
+the pages are the logged-in ones the scraper sees.
+
+``driver.get`` returns at DOMContentLoaded under the lightweight profile's
+eager strategy, so both profiles are measured to network idle instead: at
+most two requests open (LinkedIn keeps long-polling ones around) and no new
+network events for ``--idle`` seconds, capped at ``--settle-timeout``. Load
+time runs up to the start of that quiet period.
+
+Run with: python -m benchmarks.linkedin_browser_profile --url https://www.linkedin.com/company/example/ --repeat 3
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+from app.core.config import settings
+from app.modules.monitoring.browser_profile import (
+    BROWSER_PROFILES,
+    apply_profile,
+    chrome_options,
+)
+from app.modules.monitoring.linkedin_session import linkedin_session_store
+
+
+def _create_driver(profile):
+    options = chrome_options(profile)
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    service = ChromeService(executable_path=settings.CHROME_DRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=options)
+    apply_profile(driver, profile)
+    return driver
+
+
+_IDLE_MAX_IN_FLIGHT = 2
+
+
+def _wait_for_network_idle(driver, started, idle, timeout):
+    """Drain the performance log until the page goes quiet
+
+    Returns (seconds from ``started`` to the last network event, bytes
+    transferred).
+    """
+    in_flight = set()
+    total = 0
+    last_event = time.perf_counter()
+    deadline = last_event + timeout
+    while True:
+        active = False
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method, params = message["method"], message.get("params", {})
+            active = active or method.startswith("Network.")
+            if method == "Network.requestWillBeSent":
+                in_flight.add(params.get("requestId"))
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                in_flight.discard(params.get("requestId"))
+                total += params.get("encodedDataLength", 0)
+        now = time.perf_counter()
+        if active:
+            last_event = now
+        if len(in_flight) <= _IDLE_MAX_IN_FLIGHT and now - last_event >= idle:
+            break
+        if now >= deadline:
+            print(f"  {len(in_flight)} requests still open after {timeout}s")
+            break
+        time.sleep(0.1)
+    return last_event - started, total
+
+
+def _process_tree(pid):
+    pids = [pid]
+    for task in Path(f"/proc/{pid}/task").glob("*"):
+        try:
+            children = (task / "children").read_text().split()
+        except OSError:
+            continue
+        for child in children:
+            pids.extend(_process_tree(int(child)))
+    return pids
+
+
+def _rss_bytes(driver):
+    total = 0
+    for pid in _process_tree(driver.service.process.pid):
+        try:
+            status = Path(f"/proc/{pid}/status").read_text()
+        except OSError:
+            continue
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+def _run_profile(profile, urls, repeat, idle, settle_timeout):
+    driver = _create_driver(profile)
+    try:
+        restored = linkedin_session_store.restore(driver)
+        driver.get_log("performance")  # drop the session check's traffic
+
+        load_times, transferred = [], []
+        for _ in range(repeat):
+            for url in urls:
+                started = time.perf_counter()
+                driver.get(url)
+                load_time, sent = _wait_for_network_idle(
+                    driver, started, idle, settle_timeout
+                )
+                load_times.append(load_time)
+                transferred.append(sent)
+        rss = _rss_bytes(driver)
+    finally:
+        driver.quit()
+
+    print(
+        f"{profile:<12} load {statistics.median(load_times):6.2f}s median"
+        f" / {max(load_times):6.2f}s max"
+        f"  transferred {statistics.median(transferred) / 1024:9.1f} KiB/page"
+        f"  RSS {rss / 1024 / 1024:7.1f} MiB"
+        f"  ({'logged in' if restored else 'logged out'})"
+    )
+    return statistics.median(load_times), statistics.median(transferred), rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", action="append", required=True)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--idle", type=float, default=2.0,
+        help="seconds without network events that count as loaded",
+    )
+    parser.add_argument("--settle-timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--profile", action="append", choices=BROWSER_PROFILES, default=None
+    )
+    args = parser.parse_args()
+
+    results = {
+        profile: _run_profile(
+            profile, args.url, args.repeat, args.idle, args.settle_timeout
+        )
+        for profile in args.profile or BROWSER_PROFILES
+    }
+
+    if {"standard", "lightweight"} <= results.keys():
+        (load, sent, rss), (light_load, light_sent, light_rss) = (
+            results["standard"],
+            results["lightweight"],
+        )
+        print(
+            f"\nlightweight vs standard: load {load / light_load:.1f}x faster,"
+            f" {1 - light_sent / max(sent, 1):.0%} fewer bytes,"
+            f" {1 - light_rss / max(rss, 1):.0%} less memory"
+        )
+
+
+if __name__ == "__main__":
+    main()
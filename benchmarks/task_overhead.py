@@ -0,0 +1,70 @@
+"""
+Per-task overhead of the worker's async plumbing.
+
+Compares the old pattern (``asyncio.run()`` + ``database.connect()`` per task)
+with the persistent per-process runtime, using a trivial indexed lookup as the
+task body so only the plumbing is measured.
+
+Run with: python -m benchmarks.task_overhead --iterations 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.db import Database
+from app.core.runtime import runtime
+from app.modules.monitoring.models import MonitoringTarget
+
+
+async def _task_body():
+    await MonitoringTarget.find_one({"is_active": True})
+
+
+async def _legacy_task():
+    # Mirrors the old tasks, which built (and never closed) a client per run
+    db = Database()
+    await db.connect()
+    await _task_body()
+
+
+def _measure(label, fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    samples.sort()
+    print(
+        f"{label:<22} mean={statistics.mean(samples):8.2f}ms "
+        f"p50={samples[len(samples) // 2]:8.2f}ms "
+        f"p95={samples[int(len(samples) * 0.95)]:8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    _measure(
+        "asyncio.run + connect",
+        lambda: asyncio.run(_legacy_task()),
+        args.iterations,
+    )
+
+    runtime.start()
+    try:
+        _measure(
+            "persistent runtime",
+            lambda: runtime.run(_task_body()),
+            args.iterations,
+        )
+    finally:
+        runtime.shutdown()
+
+
+if __name__ == "__main__":
+    main()